@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Benchmark NoMoEmo on a reproducible synthetic corpus.
+
+The corpus is generated from a seed, so two runs with the same options
+scan byte-identical trees. Every mode runs ``python -m nomoemo`` in a
+fresh process, from bytecode compiled up front as an installed copy or a
+hook would (rewrite modes on a fresh copy of the corpus), and is timed end
+to end;
+the results - files/s, MB/s, startup time and peak RSS - are printed as
+JSON and can be saved as a baseline and compared against later:
+
+    python benchmark.py --save baseline.json
+    python benchmark.py --baseline baseline.json --tolerance 0.10
+
+Startup is measured against a bare interpreter, with the slowest imports of
+a charset-only run taken from ``-X importtime``; ``--startup-budget MS``
+fails the run if nomoemo starts more than MS milliseconds slower.
+"""
+
+import argparse
+import json
+import os
+import platform
+import py_compile
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from nomoemo import parse_size
+
+NOMOEMO = Path(__file__).with_name('nomoemo.py')
+# nomoemo runs as a module, importable through PYTHONPATH wherever the command runs
+NOMOEMO_COMMAND = [sys.executable, '-m', 'nomoemo']
+NOMOEMO_ENV = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(NOMOEMO.parent),
+                                                                      os.environ.get('PYTHONPATH')])))
+MODES = {
+    'dry-run': ['--dry-run'],
+    'remove': ['--remove', '--force'],
+    'replace': ['--replace', '--replacement', '*', '--force'],
+    'ascii-only': ['--ascii-only'],
+    'latin1-only': ['--latin1-only'],
+}
+# Characters the generator draws from
+SIMPLE_EMOJI = ['\U0001F600', '\U0001F680', '✅', '\U0001F525', '❤️', '\U0001F4A1', '#️⃣']
+ZWJ_EMOJI = ['\U0001F468‍\U0001F469‍\U0001F467‍\U0001F466', '\U0001F3F3️‍\U0001F308',
+             '\U0001F469‍\U0001F4BB']
+SKIN_TONE_EMOJI = ['\U0001F44D\U0001F3FD', '\U0001F44B\U0001F3FB', '\U0001F9D1\U0001F3FF‍\U0001F680']
+NON_ASCII_TEXT = ['é', 'ü', 'ß', '©', '—', '“', '中', 'λ']
+LINE_TEMPLATES = [
+    'def handler_{n}(request, value={n}):',
+    '    result = compute(value, "item {n}")  # step {n}',
+    '    if result is None: return {n}',
+    '// static int counter_{n} = {n};',
+    '    printf("value %d\\n", value_{n});',
+]
+SUFFIXES = ['.py', '.c', '.js', '.md', '.txt']
+# Seconds between samples of a running command's peak RSS (Linux)
+RSS_SAMPLE_INTERVAL = 0.001
+# Startup timings: interpreter arguments, None standing for a tiny clean file
+STARTUP_COMMANDS = {
+    'startup-interpreter': ['-c', 'pass'],
+    'startup-version': ['-m', 'nomoemo', '--version'],
+    'startup-emoji': ['-m', 'nomoemo', '--quiet', '--dry-run', None],
+    'startup-charset': ['-m', 'nomoemo', '--quiet', '--ascii-only', None],
+}
+
+
+def generate_corpus(root: Path, files: int = 500, mean_size: int = 8 * 1024, size_sigma: float = 1.0,
+                    emoji_density: float = 0.002, zwj_ratio: float = 0.2, skin_tone_ratio: float = 0.2,
+                    non_ascii_density: float = 0.001, clean_ratio: float = 0.7, depth: int = 3,
+                    seed: int = 0) -> Tuple[int, int]:
+    """Write a deterministic corpus under root and return its (file count, total bytes).
+    
+    File sizes follow a log-normal distribution around mean_size. A
+    clean_ratio share of the files is pure ASCII, as in most source trees;
+    the others get an emoji (split between simple, ZWJ and skin tone
+    sequences by the two ratios) or a non-emoji non-ASCII character with the
+    given per-line probabilities. Files are spread over directories nested
+    up to depth levels.
+    """
+    rng = random.Random(seed)
+    total = 0
+    for index in range(files):
+        parts = [f'd{rng.randrange(4)}' for _ in range(rng.randint(0, depth))]
+        directory = root.joinpath(*parts)
+        directory.mkdir(parents=True, exist_ok=True)
+        
+        target = max(16, int(rng.lognormvariate(0, size_sigma) * mean_size))
+        clean = rng.random() < clean_ratio
+        lines = []
+        size = 0
+        while size < target:
+            line = rng.choice(LINE_TEMPLATES).format(n=rng.randrange(10000))
+            if not clean:
+                roll = rng.random()
+                if roll < emoji_density:
+                    kind = rng.random()
+                    if kind < zwj_ratio:
+                        line += ' ' + rng.choice(ZWJ_EMOJI)
+                    elif kind < zwj_ratio + skin_tone_ratio:
+                        line += ' ' + rng.choice(SKIN_TONE_EMOJI)
+                    else:
+                        line += ' ' + rng.choice(SIMPLE_EMOJI)
+                elif roll < emoji_density + non_ascii_density:
+                    line += ' ' + rng.choice(NON_ASCII_TEXT)
+            lines.append(line)
+            size += len(line) + 1
+        data = ('\n'.join(lines) + '\n').encode('utf-8')
+        (directory / f'f{index:06d}{rng.choice(SUFFIXES)}').write_bytes(data)
+        total += len(data)
+    return files, total
+
+
+def read_vm_hwm(pid: int) -> Optional[int]:
+    """Return a running process's VmHWM (peak RSS of its current program) in KiB, or None if unavailable."""
+    try:
+        with open(f'/proc/{pid}/status', 'rb') as f:
+            for line in f:
+                if line.startswith(b'VmHWM:'):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def run_timed(command: List[str]) -> Tuple[float, Optional[int]]:
+    """Run a command, returning its wall time in seconds and peak RSS in KiB (None if unknown).
+    
+    On Linux ru_maxrss from wait4 keeps the high-water mark of the process
+    that forked the command, so it is never below this script's own RSS.
+    There the peak is the command's own VmHWM instead, sampled by a thread
+    every RSS_SAMPLE_INTERVAL while the main thread waits (Popen returns
+    only once the command is exec'd, so every sample is of the command).
+    VmHWM only grows, so the last sample is the peak up to the final
+    interval. Elsewhere ru_maxrss is used.
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=NOMOEMO_ENV)
+    samples = []
+    done = threading.Event()
+    
+    def sample():
+        while not done.is_set():
+            hwm = read_vm_hwm(process.pid)
+            if hwm is None:
+                return
+            samples.append(hwm)
+            done.wait(RSS_SAMPLE_INTERVAL)
+    
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    if hasattr(os, 'wait4'):
+        _, status, usage = os.wait4(process.pid, 0)
+        elapsed = time.perf_counter() - start
+        process.returncode = os.waitstatus_to_exitcode(status)
+        # ru_maxrss is in KiB on Linux and in bytes on macOS
+        peak_rss = usage.ru_maxrss // 1024 if sys.platform == 'darwin' else usage.ru_maxrss
+    else:
+        process.wait()
+        elapsed = time.perf_counter() - start
+        peak_rss = None
+    done.set()
+    sampler.join()
+    if samples:
+        peak_rss = samples[-1]
+    if process.returncode != 0:
+        raise RuntimeError(f"{' '.join(command)} exited with {process.returncode}")
+    return elapsed, peak_rss
+
+
+def benchmark(corpus: Path, files: int, total_bytes: int, modes: List[str], repeat: int,
+              extra_args: List[str]) -> Dict:
+    """Time every mode over the corpus, keeping the fastest of repeat runs."""
+    base = [*NOMOEMO_COMMAND, '--quiet', '--recursive', *extra_args]
+    results = {}
+    # Compiled once here, so no run pays for compiling the script (PYTHONDONTWRITEBYTECODE would skip it)
+    py_compile.compile(str(NOMOEMO), doraise=True)
+    
+    # Startup: a bare interpreter, --version, and one tiny clean file in an emoji and a charset mode
+    with tempfile.TemporaryDirectory() as scratch:
+        tiny = Path(scratch) / 'tiny.py'
+        tiny.write_text('x = 1\n', encoding='utf-8')
+        for name, command in STARTUP_COMMANDS.items():
+            command = [sys.executable, *(str(tiny) if arg is None else arg for arg in command)]
+            timings = [run_timed(command) for _ in range(max(3, repeat))]
+            results[name] = {'seconds': min(t for t, _ in timings), 'peak_rss_kib': timings[0][1]}
+    
+    for mode in modes:
+        timings = []
+        for _ in range(repeat):
+            if mode in ('remove', 'replace'):
+                with tempfile.TemporaryDirectory() as scratch:
+                    copy = Path(scratch) / 'corpus'
+                    shutil.copytree(corpus, copy)
+                    timings.append(run_timed([*base, *MODES[mode], str(copy)]))
+            else:
+                timings.append(run_timed([*base, *MODES[mode], str(corpus)]))
+        seconds = min(t for t, _ in timings)
+        rss = [r for _, r in timings if r is not None]
+        results[mode] = {
+            'seconds': seconds,
+            'files_per_s': files / seconds,
+            'mb_per_s': total_bytes / (1024 * 1024) / seconds,
+            'peak_rss_kib': max(rss) if rss else None,
+        }
+    return results
+
+
+def slowest_imports(count: int = 10) -> List[Dict]:
+    """Return the top-level imports of a charset-only startup, slowest (cumulative) first."""
+    with tempfile.TemporaryDirectory() as scratch:
+        tiny = Path(scratch) / 'tiny.py'
+        tiny.write_text('x = 1\n', encoding='utf-8')
+        completed = subprocess.run([sys.executable, '-X', 'importtime', '-m', 'nomoemo', '--quiet', '--ascii-only',
+                                    str(tiny)], capture_output=True, text=True, check=True, env=NOMOEMO_ENV)
+    imports = []
+    for line in completed.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package", nested imports are indented
+        fields = line.split('|')
+        if len(fields) != 3 or not line.startswith('import time:') or fields[2].startswith('  '):
+            continue
+        try:
+            imports.append({'module': fields[2].strip(), 'cumulative_us': int(fields[1])})
+        except ValueError:
+            continue  # The header line
+    return sorted(imports, key=lambda entry: entry['cumulative_us'], reverse=True)[:count]
+
+
+def check_startup(results: Dict, budget_ms: float) -> List[str]:
+    """Return a message for every startup timing more than budget_ms over the bare interpreter."""
+    bare = results['startup-interpreter']['seconds']
+    messages = []
+    for name in STARTUP_COMMANDS:
+        overhead_ms = (results[name]['seconds'] - bare) * 1000
+        if name != 'startup-interpreter' and overhead_ms > budget_ms:
+            messages.append(f"{name}: {overhead_ms:.0f} ms over the bare interpreter (budget {budget_ms:.0f} ms)")
+    return messages
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Return a message for every timing more than tolerance slower than the baseline."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        ratio = current['seconds'] / previous['seconds']
+        if ratio > 1 + tolerance:
+            regressions.append(f"{name}: {current['seconds']:.3f}s vs {previous['seconds']:.3f}s baseline "
+                               f"({(ratio - 1) * 100:.0f}% slower)")
+    return regressions
+
+
+def main() -> int:
+    """Generate the corpus, run the benchmarks and report them."""
+    parser = argparse.ArgumentParser(description="Benchmark nomoemo.py on a synthetic corpus")
+    parser.add_argument('--files', type=int, default=500, help='Number of files (default: 500)')
+    parser.add_argument('--mean-size', type=parse_size, default=8 * 1024, metavar='SIZE',
+                        help='Median file size, K/M/G suffixes allowed (default: 8K)')
+    parser.add_argument('--size-sigma', type=float, default=1.0,
+                        help='Spread of the log-normal file size distribution (default: 1.0)')
+    parser.add_argument('--emoji-density', type=float, default=0.002,
+                        help='Probability of an emoji per line in non-clean files (default: 0.002)')
+    parser.add_argument('--zwj-ratio', type=float, default=0.2, help='Share of ZWJ sequences among emoji')
+    parser.add_argument('--skin-tone-ratio', type=float, default=0.2,
+                        help='Share of skin tone sequences among emoji')
+    parser.add_argument('--non-ascii-density', type=float, default=0.001,
+                        help='Probability of a non-emoji non-ASCII character per line (default: 0.001)')
+    parser.add_argument('--clean-ratio', type=float, default=0.7, help='Share of pure-ASCII files (default: 0.7)')
+    parser.add_argument('--depth', type=int, default=3, help='Maximum directory depth (default: 3)')
+    parser.add_argument('--seed', type=int, default=0, help='Corpus random seed (default: 0)')
+    parser.add_argument('--modes', nargs='+', choices=list(MODES), default=list(MODES), help='Modes to run')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per mode; the fastest counts (default: 3)')
+    parser.add_argument('--corpus', metavar='DIR', help='Generate the corpus here and keep it')
+    parser.add_argument('--save', metavar='FILE', help='Also write the results to FILE')
+    parser.add_argument('--baseline', metavar='FILE', help='Compare against results saved with --save')
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                        help='Allowed slowdown against the baseline (default: 0.10)')
+    parser.add_argument('--startup-budget', type=float, metavar='MS',
+                        help='Fail if any startup timing exceeds the bare interpreter by more than MS milliseconds')
+    parser.add_argument('nomoemo_args', nargs=argparse.REMAINDER,
+                        help='Extra nomoemo.py arguments after --, e.g. -- --jobs 4')
+    args = parser.parse_args()
+    extra_args = [arg for arg in args.nomoemo_args if arg != '--']
+    
+    corpus_options = {
+        'files': args.files, 'mean_size': args.mean_size, 'size_sigma': args.size_sigma,
+        'emoji_density': args.emoji_density, 'zwj_ratio': args.zwj_ratio,
+        'skin_tone_ratio': args.skin_tone_ratio, 'non_ascii_density': args.non_ascii_density,
+        'clean_ratio': args.clean_ratio, 'depth': args.depth, 'seed': args.seed,
+    }
+    with tempfile.TemporaryDirectory() as scratch:
+        corpus = Path(args.corpus) if args.corpus else Path(scratch) / 'corpus'
+        if corpus.exists() and any(corpus.iterdir()):
+            print(f"Corpus directory {corpus} is not empty", file=sys.stderr)
+            return 1
+        corpus.mkdir(parents=True, exist_ok=True)
+        files, total_bytes = generate_corpus(corpus, **corpus_options)
+        results = benchmark(corpus, files, total_bytes, args.modes, args.repeat, extra_args)
+    
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'corpus': dict(corpus_options, total_bytes=total_bytes),
+        'nomoemo_args': extra_args,
+        'results': results,
+        'startup_imports': slowest_imports(),
+    }
+    print(json.dumps(report, indent=2))
+    if args.save:
+        Path(args.save).write_text(json.dumps(report, indent=2) + '\n', encoding='utf-8')
+    
+    failed = False
+    if args.startup_budget is not None:
+        for message in check_startup(results, args.startup_budget):
+            print(f"Over startup budget: {message}", file=sys.stderr)
+            failed = True
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding='utf-8'))
+        if baseline.get('corpus') != report['corpus']:
+            print("Warning: baseline was measured on a different corpus", file=sys.stderr)
+        regressions = compare(results, baseline.get('results', {}), args.tolerance)
+        for message in regressions:
+            print(f"Regression: {message}", file=sys.stderr)
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
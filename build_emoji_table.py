@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Regenerate the precomputed emoji matcher tables for NoMoEmo.
+
+nomoemo.py loads its emoji trie from nomoemo_emoji.json so startup pays
+neither a sort nor a regex compile. Run this script after upgrading the
+emoji library; until then, nomoemo.py rebuilds the tables in memory on
+every run because the stored emoji version no longer matches.
+"""
+
+import sys
+from pathlib import Path
+
+from nomoemo import EMOJI_TABLE_PATH, EmojiMatcher
+
+
+def main():
+    """Build the tables from the installed emoji library and write them out."""
+    path = Path(sys.argv[1]) if len(sys.argv) > 1 else EMOJI_TABLE_PATH
+    matcher = EmojiMatcher.from_emoji_data()
+    matcher.save(path)
+    print(f"Wrote {len(matcher.nodes)} trie nodes for emoji {matcher.version} to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,38 +10,1296 @@ Version: 0.0.1
 """
 
 import argparse
+import array
+import bisect
+import codecs
+import contextlib
+import functools
+import heapq
+import io
+import itertools
+import json
 import logging
+import mmap
+import stat
 import sys
 import os
+import time
+from collections import Counter, deque
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import TYPE_CHECKING, Callable, List, Dict, Iterable, Iterator, Optional, Tuple
 import re
-import emoji
+
+if TYPE_CHECKING:
+    import socket
+
+# Modules only some options need (emoji, sqlite3, hashlib, subprocess,
+# tempfile, concurrent.futures, difflib, socket, cProfile) are imported where
+# they are used, so --version, argument errors and charset-only runs start
+# about as fast as the interpreter itself (see benchmark.py --startup-budget).
+
+
+# Precomputed emoji trie shipped next to this script (see build_emoji_table.py)
+EMOJI_TABLE_PATH = Path(__file__).with_name('nomoemo_emoji.json')
+EMOJI_TABLE_FORMAT = 1
+
+_ZWJ = '\u200d'
+_VARIATION_SELECTORS = frozenset('\ufe0e\ufe0f')
+_SKIN_TONE_MODIFIERS = frozenset(chr(cp) for cp in range(0x1F3FB, 0x1F400))
+
+# Characters outside each checked character set, searched for in C
+_CHARSET_VIOLATION_REGEX = {
+    'ascii': re.compile(r'[^\x00-\x7f]'),
+    'latin1': re.compile(r'[^\x00-\xff]'),
+}
+_NEWLINE_REGEX = re.compile('\n')
+
+# Files at least this large are scanned in bounded chunks (see --stream-threshold)
+DEFAULT_STREAM_THRESHOLD = 16 * 1024 * 1024
+STREAM_CHUNK_SIZE = 1024 * 1024
+# Characters held back at the end of each streamed window, so emoji sequences
+# straddling a chunk edge are matched whole in the next window
+STREAM_OVERLAP = 64
+# Characters shown on either side of a finding in verbose reports
+CONTEXT_CHARS = 20
+# Default size budget of the --cache database
+DEFAULT_CACHE_SIZE = 64 * 1024 * 1024
+# Read-only scans memory-map files at least this large (see --no-mmap)
+MMAP_THRESHOLD = 1024 * 1024
+# Mapped files are checked for non-ASCII bytes in blocks of this size
+MMAP_BLOCK_SIZE = 64 * 1024
+# Files read into memory are checked for non-ASCII bytes in blocks of this size
+SCAN_BLOCK_SIZE = 4 * 1024
+
+_LONE_CR_BYTES_REGEX = re.compile(rb'\r(?!\n)')
+# Bytes that continue a UTF-8 character; every other byte starts one
+_UTF8_CONTINUATION_BYTES = bytes(range(0x80, 0xC0))
+# The last ASCII byte that cannot begin a keycap sequence; no emoji sequence spans it
+_LAST_BREAK_BYTE_REGEX = re.compile(rb'[^\x80-\xff#*0-9][\x80-\xff#*0-9]*\Z')
+
+# Name findings on standard input are reported under (see --stdin)
+STDIN_NAME = '<stdin>'
+# Bytes a --stdin rewrite holds back at most while waiting for a safe split point
+STDIN_MAX_CARRY = 4 * STREAM_CHUNK_SIZE
+
+# Directory names skipped during traversal unless --no-default-excludes is given
+DEFAULT_EXCLUDE_DIRS = frozenset({
+    '.git', '.hg', '.svn', 'node_modules', '__pycache__', '.venv', 'venv',
+    '.tox', '.nox', '.mypy_cache', '.pytest_cache', '.ruff_cache',
+})
+# Ignore files read in every traversed directory (see --no-ignore)
+IGNORE_FILE_NAMES = ('.gitignore', '.nomoemoignore')
+# File name suffixes skipped without opening the file (see --exclude-ext)
+DEFAULT_SKIP_SUFFIXES = frozenset({
+    '.exe', '.dll', '.so', '.dylib', '.bin', '.jpg', '.png', '.gif', '.bmp',
+    '.mp4', '.avi', '.pdf',
+})
+# Archive suffixes, skipped like the binary ones unless --archives scans inside them
+ARCHIVE_SUFFIXES = frozenset({'.zip', '.tar', '.gz', '.tgz', '.bz2', '.tbz2', '.xz', '.txz'})
+# Names of the archives --archives opens (a bare .gz is a compressed file, not an archive)
+_TAR_NAME_SUFFIXES = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')
+# Default limits on what --archives reads from one archive
+DEFAULT_ARCHIVE_MEMBER_SIZE = 16 * 1024 * 1024
+DEFAULT_ARCHIVE_MEMBERS = 10000
+# Leading bytes inspected to tell text files from binary ones
+SNIFF_SIZE = 1024
+# Byte order marks recognised by _classify_text, with the codec that reads the text
+# behind them and the codec that writes it back; UTF-32 LE first, its mark begins
+# with UTF-16 LE's
+_BOM_ENCODINGS = (
+    (codecs.BOM_UTF32_LE, 'utf-32', 'utf-32-le'),
+    (codecs.BOM_UTF32_BE, 'utf-32', 'utf-32-be'),
+    (codecs.BOM_UTF16_LE, 'utf-16', 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16', 'utf-16-be'),
+)
+# Control characters that text, unlike binary data, all but never contains
+_CONTROL_CHARS_REGEX = re.compile('[\x00-\x08\x0e-\x1a\x1c-\x1f\x7f]')
+# Largest share of control characters in the sniffed text of a non-UTF-8 file
+MAX_CONTROL_RATIO = 0.01
+# Files handed to a --jobs worker per task
+WORKER_BATCH_SIZE = 16
+# Codepoints and files listed in the verbose charset summary
+CHARSET_HISTOGRAM_TOP = 10
+# Write buffer of the --format reporters
+REPORT_BUFFER_SIZE = 256 * 1024
+# Rule ids and descriptions of the findings written by --format reporters
+REPORT_RULES = {
+    'emoji': 'Emoji character or sequence',
+    'non-ascii': 'Character outside ASCII (codepoint > 127)',
+    'non-latin1': 'Character outside Latin-1 (codepoint > 255)',
+}
+
+
+def parse_suffix(value: str) -> str:
+    """Normalize a file extension argument ('py', '.PY') to a lowercase suffix ('.py')."""
+    suffix = value.strip().lower()
+    if not suffix or suffix == '.':
+        raise argparse.ArgumentTypeError(f"invalid extension: '{value}'")
+    return suffix if suffix.startswith('.') else '.' + suffix
+
+
+def _classify_text(head: bytes, final: bool) -> Optional[str]:
+    """Classify a file from its leading bytes: return the codec of its text, or None if it is binary.
+    
+    The common case is settled exactly as before: no NUL bytes and valid
+    UTF-8 is 'utf-8' (a UTF-8 BOM stays part of the text). Otherwise a UTF-16
+    or UTF-32 byte order mark gives 'utf-16' or 'utf-32', whose decoders
+    consume it. Failing that, byte statistics decide: NUL bytes in only one
+    position of each byte pair are the high bytes of BOM-less UTF-16
+    ('utf-16-le' or 'utf-16-be'), and no NUL bytes at all is Latin-1. Every
+    guess beyond UTF-8 must decode and have hardly any control characters
+    (see MAX_CONTROL_RATIO). Unless head is the whole file (final), a
+    character cut off at the end of head does not count against it.
+    """
+    if b'\x00' not in head:
+        try:
+            codecs.utf_8_decode(head, 'strict', final)
+            return 'utf-8'
+        except UnicodeDecodeError:
+            pass
+    
+    for bom, encoding, _ in _BOM_ENCODINGS:
+        if head.startswith(bom):
+            break
+    else:
+        if b'\x00' not in head:
+            encoding = 'latin-1'
+        else:
+            pairs = len(head) // 2 * 2
+            even_nuls, odd_nuls = head[0:pairs:2].count(0), head[1:pairs:2].count(0)
+            if odd_nuls > 8 * even_nuls:
+                encoding = 'utf-16-le'
+            elif even_nuls > 8 * odd_nuls:
+                encoding = 'utf-16-be'
+            else:
+                return None
+    try:
+        text = codecs.getincrementaldecoder(encoding)().decode(head, final)
+    except UnicodeDecodeError:
+        return None
+    if len(_CONTROL_CHARS_REGEX.findall(text)) > len(text) * MAX_CONTROL_RATIO:
+        return None
+    return encoding
+
+
+def _output_codec(encoding: str, head: bytes) -> Tuple[bytes, str]:
+    """Return the byte order mark and the codec that write text back the way head has it.
+    
+    The BOM codecs 'utf-16' and 'utf-32' would write the platform's byte
+    order; this keeps the original one.
+    """
+    for bom, bom_encoding, codec in _BOM_ENCODINGS:
+        if bom_encoding == encoding and head.startswith(bom):
+            return bom, codec
+    return b'', encoding
+
+
+def _read_text(f, size: int) -> Tuple[Optional[bytes], Optional[str]]:
+    """Read an open binary file whole with its codec, or return (None, None) if its first bytes show it is binary.
+    
+    Only SNIFF_SIZE bytes are read before the file is classified (see
+    _classify_text), so binary files are never loaded in full.
+    """
+    head = f.read(SNIFF_SIZE)
+    encoding = _classify_text(head, size <= SNIFF_SIZE)
+    if encoding is None:
+        return None, None
+    return head + f.read(), encoding
+
+
+def _archive_kind(name: str) -> Optional[str]:
+    """Return 'zip' or 'tar' if a file name is one of the archives --archives scans, else None."""
+    name = name.lower()
+    if name.endswith('.zip'):
+        return 'zip'
+    if name.endswith(_TAR_NAME_SUFFIXES):
+        return 'tar'
+    return None
+
+
+def _decode_text(data: bytes, encoding: str = 'utf-8') -> str:
+    """Decode bytes (UTF-8 unless given) with the universal newline translation of text mode."""
+    text = data.decode(encoding)
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def _stream_split(data: bytes) -> int:
+    """Return how much of a UTF-8 stream's pending bytes can be rewritten without the rest.
+    
+    That is everything up to the last newline, or else up to the last ASCII
+    byte that cannot start a keycap: no emoji sequence contains either, so
+    none straddles the split. Returns 0 if there is no such byte, unless
+    more than STDIN_MAX_CARRY bytes are pending; then the split falls on
+    the last character boundary so memory stays bounded.
+    """
+    split = data.rfind(b'\n') + 1
+    if split:
+        return split
+    match = _LAST_BREAK_BYTE_REGEX.search(data)
+    if match:
+        return match.start() + 1
+    if len(data) <= STDIN_MAX_CARRY:
+        return 0
+    split = len(data) - 1
+    while split > 0 and 0x80 <= data[split] < 0xC0:
+        split -= 1  # Back up over continuation bytes to a character's first byte
+    return split
+
+
+def _splice_text(text: str, spans: List[Tuple[int, int]], replacement: str) -> str:
+    """Return text with every (start, end) span replaced by replacement."""
+    pieces = []
+    pos = 0
+    for start, end in spans:
+        pieces.append(text[pos:start])
+        pieces.append(replacement)
+        pos = end
+    pieces.append(text[pos:])
+    return ''.join(pieces)
+
+
+def _byte_spans(content: str, spans: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Convert (start, end) character offsets in content to offsets in its UTF-8 encoding."""
+    byte_spans = []
+    char_pos = byte_pos = 0
+    for start, end in spans:
+        gap = content[char_pos:start]
+        byte_pos += len(gap) if gap.isascii() else len(gap.encode('utf-8'))
+        byte_start = byte_pos
+        byte_pos += len(content[start:end].encode('utf-8'))
+        byte_spans.append((byte_start, byte_pos))
+        char_pos = end
+    return byte_spans
+
+
+def _atomic_write(file_path: Path, pieces: Iterable[bytes], fsync: bool = False):
+    """Replace a file's contents without ever leaving it partially written.
+    
+    The pieces go to a temporary file in the same directory, which gets the
+    original's owner and group (where allowed, e.g. when run as root) and
+    permission bits and is then renamed over it with os.replace.
+    A symlink is followed, so the link itself stays in place. With fsync the
+    data is flushed to disk before the rename; syncing the directory entry
+    is left to the caller (see NoMoEmo._sync_directories).
+    """
+    import tempfile
+    
+    target = Path(os.path.realpath(file_path))
+    target_stat = target.stat()
+    mode = stat.S_IMODE(target_stat.st_mode)
+    fd, tmp_name = tempfile.mkstemp(prefix=f'.{target.name}.', suffix='.tmp', dir=target.parent)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.writelines(pieces)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        if hasattr(os, 'chown'):
+            with contextlib.suppress(PermissionError):
+                os.chown(tmp_name, target_stat.st_uid, target_stat.st_gid)
+        os.chmod(tmp_name, mode)  # After chown, which may clear setuid/setgid bits
+        os.replace(tmp_name, target)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_name)
+        raise
+
+
+def parse_size(value: str) -> int:
+    """Parse a byte size with an optional K/M/G suffix (e.g. '16M') for argparse."""
+    units = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+    text = value.strip().upper()
+    if text.endswith('B'):
+        text = text[:-1]
+    multiplier = 1
+    if text and text[-1] in units:
+        multiplier = units[text[-1]]
+        text = text[:-1]
+    try:
+        size = int(text) * multiplier
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid size: '{value}'")
+    if size < 0:
+        raise argparse.ArgumentTypeError(f"size must not be negative: '{value}'")
+    return size
+
+
+class EmojiMatcher:
+    """Codepoint trie over every emoji sequence in ``emoji.EMOJI_DATA``.
+    
+    Matching is longest-match at each candidate position. Candidates are found
+    with a compiled character class of possible first codepoints, so runs of
+    ASCII (and most other non-emoji text) are skipped in C. On top of the RGI
+    sequences in the trie, a match absorbs a trailing skin tone modifier or
+    variation selector it did not already consume, and emoji joined by ZWJ
+    (including non-RGI combinations) are reported as one sequence.
+    """
+    
+    def __init__(self, nodes: List[Dict[str, int]], accepting: set, version: str):
+        self.nodes = nodes  # Node 0 is the root; each node maps a char to a child index
+        self.accepting = accepting  # Indices of nodes that complete an emoji sequence
+        self.version = version  # emoji library version the tables were built from
+        self._candidate_regex = self._build_candidate_regex()
+    
+    @classmethod
+    def from_emoji_data(cls) -> 'EmojiMatcher':
+        """Build the trie from the installed emoji library's data."""
+        import emoji
+        
+        nodes = [{}]
+        accepting = set()
+        for sequence in emoji.EMOJI_DATA:
+            node = 0
+            for char in sequence:
+                child = nodes[node].get(char)
+                if child is None:
+                    child = len(nodes)
+                    nodes.append({})
+                    nodes[node][char] = child
+                node = child
+            accepting.add(node)
+        return cls(nodes, accepting, emoji.__version__)
+    
+    @classmethod
+    def load(cls, path: Path = EMOJI_TABLE_PATH) -> 'EmojiMatcher':
+        """Load the precomputed tables, rebuilding them if missing or stale."""
+        import emoji
+        
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                table = json.load(f)
+            if table['format'] == EMOJI_TABLE_FORMAT and table['emoji_version'] == emoji.__version__:
+                return cls(table['nodes'], set(table['accepting']), table['emoji_version'])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return cls.from_emoji_data()
+    
+    def save(self, path: Path):
+        """Serialize the tables as JSON (ASCII-only, so this repo stays emoji free)."""
+        table = {
+            'format': EMOJI_TABLE_FORMAT,
+            'emoji_version': self.version,
+            'accepting': sorted(self.accepting),
+            'nodes': self.nodes,
+        }
+        with open(path, 'w', encoding='ascii') as f:
+            json.dump(table, f, separators=(',', ':'))
+    
+    def _build_candidate_regex(self) -> re.Pattern:
+        """Compile a search for the non-ASCII codepoints an emoji can start with.
+        
+        Emoji that start with an ASCII char (keycaps like '#' + U+FE0F + U+20E3)
+        are found through their non-ASCII second codepoint instead, so the search
+        never stops on ordinary ASCII text.
+        """
+        root = self.nodes[0]
+        codepoints = {ord(char) for char in root if ord(char) > 127}
+        for char, child in root.items():
+            if ord(char) <= 127:
+                codepoints.update(ord(c) for c in self.nodes[child])
+        
+        # Exact ranges for the BMP; the astral starts are covered by a single
+        # range since sre tests a long list of astral ranges one by one
+        bmp = sorted(cp for cp in codepoints if cp <= 0xFFFF)
+        astral = [cp for cp in codepoints if cp > 0xFFFF]
+        ranges = []
+        for cp in bmp:
+            if ranges and ranges[-1][1] == cp - 1:
+                ranges[-1][1] = cp
+            else:
+                ranges.append([cp, cp])
+        if astral:
+            ranges.append([min(astral), max(astral)])
+        char_class = ''.join(
+            f'\\U{lo:08x}' if lo == hi else f'\\U{lo:08x}-\\U{hi:08x}' for lo, hi in ranges
+        )
+        # Leading on a plain non-ASCII class keeps sre's fast skip over ASCII
+        return re.compile(f'[^\\x00-\\x7f](?<=[{char_class}])')
+    
+    def _match_at(self, text: str, start: int) -> Optional[int]:
+        """Return the end of the longest emoji starting at start, or None."""
+        nodes = self.nodes
+        accepting = self.accepting
+        length = len(text)
+        node = 0
+        end = None
+        i = start
+        while i < length:
+            node = nodes[node].get(text[i])
+            if node is None:
+                break
+            i += 1
+            if node in accepting:
+                end = i
+        
+        if end is not None:
+            if end < length and text[end] in _SKIN_TONE_MODIFIERS:
+                end += 1
+            if end < length and text[end] in _VARIATION_SELECTORS:
+                end += 1
+        return end
+    
+    def find_spans(self, text: str, pos: int = 0) -> List[Tuple[int, int]]:
+        """Return the (start, end) offsets of every emoji in text[pos:], in order."""
+        spans = []
+        search = self._candidate_regex.search
+        nodes = self.nodes
+        root = nodes[0]
+        length = len(text)
+        while True:
+            candidate = search(text, pos)
+            if candidate is None:
+                break
+            start = candidate.start()
+            end = None
+            
+            # A keycap continuation may belong to an emoji starting one char back
+            if start > pos:
+                child = root.get(text[start - 1])
+                if child is not None and text[start] in nodes[child]:
+                    end = self._match_at(text, start - 1)
+                    if end is not None:
+                        start -= 1
+            if end is None:
+                end = self._match_at(text, start)
+            if end is None:
+                pos = start + 1
+                continue
+            
+            # Emoji joined by ZWJ form one sequence, even when not RGI
+            while end + 1 < length and text[end] == _ZWJ:
+                joined_end = self._match_at(text, end + 1)
+                if joined_end is None:
+                    break
+                end = joined_end
+            
+            spans.append((start, end))
+            pos = end
+        return spans
+
+
+_emoji_matcher = None
+
+
+def get_emoji_matcher() -> EmojiMatcher:
+    """Return the process-wide EmojiMatcher, loading it on first use."""
+    global _emoji_matcher
+    if _emoji_matcher is None:
+        _emoji_matcher = EmojiMatcher.load()
+    return _emoji_matcher
+
+
+class LineIndex:
+    """Newline offsets of a text, collected once, for locating findings.
+    
+    Each lookup is a bisection, so reporting thousands of findings in a file
+    no longer rescans the text from the start for every one of them. The
+    offsets are only collected on the first lookup. When the text is a window
+    into a larger stream, ``base_line`` and ``base_col`` give the position of
+    its first character so locations stay absolute.
+    """
+    
+    __slots__ = ('text', 'base_line', 'base_col', '_newline_offsets')
+    
+    def __init__(self, text: str, base_line: int = 1, base_col: int = 0):
+        self.text = text
+        self.base_line = base_line  # 1-based line number of text[0]
+        self.base_col = base_col  # Characters on that line before text[0]
+        self._newline_offsets = None
+    
+    @property
+    def newline_offsets(self) -> List[int]:
+        if self._newline_offsets is None:
+            self._newline_offsets = [match.start() for match in _NEWLINE_REGEX.finditer(self.text)]
+        return self._newline_offsets
+    
+    def state_at(self, offset: int) -> Tuple[int, int]:
+        """Return the (base_line, base_col) for a window starting at offset."""
+        newline_offsets = self.newline_offsets
+        line_index = bisect.bisect_left(newline_offsets, offset)
+        if line_index:
+            return self.base_line + line_index, offset - newline_offsets[line_index - 1] - 1
+        return self.base_line, self.base_col + offset
+    
+    def locate(self, offset: int) -> Tuple[int, int]:
+        """Return the 1-based (line, column) of a character offset."""
+        line_num, col = self.state_at(offset)
+        return line_num, col + 1
+
+
+def _non_ascii_regions(buffer, block_size: int = MMAP_BLOCK_SIZE) -> Iterator[Tuple[int, int]]:
+    """Yield (start, end) byte ranges covering every non-ASCII byte in buffer.
+    
+    The buffer is checked in block_size blocks with bytes.isascii(),
+    which is far faster than a regex over the buffer even with the slice
+    copy. Runs of non-ASCII blocks become one region, widened by an ASCII
+    margin on both sides (room for report context and for a keycap's ASCII
+    first char); the neighbouring blocks are pure ASCII, so every region
+    starts and ends on a character boundary. The margin is doubled since a
+    CRLF is two bytes but one character once translated.
+    """
+    margin = 2 * (CONTEXT_CHARS + 1)
+    size = len(buffer)
+    region_start = region_end = None
+    for block_start in range(0, size, block_size):
+        block_end = min(size, block_start + block_size)
+        if buffer[block_start:block_end].isascii():
+            continue
+        
+        start = max(0, block_start - margin)
+        end = min(size, block_end + margin)
+        if region_end is not None and start <= region_end:
+            region_end = end
+            continue
+        if region_end is not None:
+            yield _close_region(buffer, region_start, region_end)
+        region_start, region_end = start, end
+    if region_end is not None:
+        yield _close_region(buffer, region_start, region_end)
+
+
+def _close_region(buffer, start: int, end: int) -> Tuple[int, int]:
+    """Extend a region end that falls inside a CRLF pair past the LF."""
+    if buffer[end - 1:end] == b'\r' and buffer[end:end + 1] == b'\n':
+        end += 1
+    return start, end
+
+
+def _count_chars(buffer, start: int, end: int) -> int:
+    """Count the UTF-8 characters in buffer[start:end] without decoding or copying more than a chunk at a time."""
+    count = 0
+    while start < end:
+        stop = min(end, start + STREAM_CHUNK_SIZE)
+        count += len(buffer[start:stop].translate(None, _UTF8_CONTINUATION_BYTES))
+        start = stop
+    return count
+
+
+def _count_newlines(buffer, start: int, end: int) -> int:
+    """Count b'\\n' in buffer[start:end] without copying more than a chunk at a time."""
+    count = 0
+    while start < end:
+        stop = min(end, start + STREAM_CHUNK_SIZE)
+        count += buffer[start:stop].count(b'\n')
+        start = stop
+    return count
+
+
+def _translate_ignore_pattern(pattern: str) -> str:
+    """Translate the glob part of a gitignore pattern into a regex body.
+    
+    ``*`` and ``?`` do not cross ``/``; ``**/`` matches any number of
+    leading directories and a trailing ``/**`` everything inside.
+    """
+    parts = []
+    i, n = 0, len(pattern)
+    while i < n:
+        char = pattern[i]
+        if pattern.startswith('**/', i) and (i == 0 or pattern[i - 1] == '/'):
+            parts.append('(?:.*/)?')
+            i += 3
+            continue
+        if pattern.startswith('/**', i) and i + 3 == n:
+            parts.append('/.+')
+            break
+        if char == '*':
+            parts.append('[^/]*')
+        elif char == '?':
+            parts.append('[^/]')
+        elif char == '\\' and i + 1 < n:
+            i += 1
+            parts.append(re.escape(pattern[i]))
+        elif char == '[':
+            end = pattern.find(']', i + 2)
+            if end < 0:
+                parts.append(re.escape(char))
+            else:
+                body = pattern[i + 1:end]
+                negate = body[0] in '!^'
+                if negate:
+                    body = body[1:]
+                body = body.replace('\\', '\\\\')
+                parts.append(f"[{'^' if negate else ''}{body}]")
+                i = end
+        else:
+            parts.append(re.escape(char))
+        i += 1
+    return ''.join(parts)
+
+
+class IgnoreRules:
+    """Compiled patterns of the ignore files in one directory.
+    
+    Follows .gitignore semantics: ``#`` comments, ``!`` negation, a trailing
+    ``/`` for directory-only patterns, and patterns without an inner ``/``
+    matching at any depth. All patterns are folded into one alternation per
+    entry type, in reverse order, so a single regex match finds the last
+    matching pattern, which is the one that decides.
+    """
+    
+    __slots__ = ('file_regex', 'dir_regex', 'negated')
+    
+    def __init__(self, lines: List[str]):
+        file_parts = []
+        dir_parts = []
+        self.negated = set()  # Group names of '!' patterns
+        for index, line in enumerate(lines):
+            line = line.rstrip('\r\n')
+            # Trailing spaces are ignored unless escaped
+            stripped = line.rstrip(' ')
+            if stripped.endswith('\\') and len(stripped) < len(line):
+                stripped += ' '
+            line = stripped
+            if not line or line.startswith('#'):
+                continue
+            negate = line.startswith('!')
+            if negate:
+                line = line[1:]
+            elif line.startswith(('\\!', '\\#')):
+                line = line[1:]
+            dir_only = line.endswith('/')
+            line = line.rstrip('/')
+            if not line:
+                continue
+            anchored = '/' in line
+            body = _translate_ignore_pattern(line.lstrip('/'))
+            if not anchored:
+                body = '(?:.*/)?' + body
+            
+            group = f'p{index}'
+            if negate:
+                self.negated.add(group)
+            part = f'(?P<{group}>{body})'
+            dir_parts.append(part)
+            if not dir_only:
+                file_parts.append(part)
+        
+        self.file_regex = self._compile(file_parts)
+        self.dir_regex = self._compile(dir_parts)
+    
+    @staticmethod
+    def _compile(parts: List[str]):
+        if not parts:
+            return None
+        try:
+            return re.compile('|'.join(reversed(parts)), re.DOTALL)
+        except re.error:
+            # A malformed pattern should not drop the whole file
+            valid = []
+            for part in parts:
+                try:
+                    re.compile(part)
+                    valid.append(part)
+                except re.error:
+                    continue
+            return re.compile('|'.join(reversed(valid)), re.DOTALL) if valid else None
+    
+    @classmethod
+    def from_directory(cls, directory: Path, names: Iterable[str] = IGNORE_FILE_NAMES) -> Optional['IgnoreRules']:
+        """Load the ignore files present in directory, or None if there are none.
+        
+        .nomoemoignore is read after .gitignore, so its patterns take precedence.
+        """
+        lines = []
+        for name in IGNORE_FILE_NAMES:
+            if name not in names:
+                continue
+            try:
+                with open(directory / name, 'r', encoding='utf-8', errors='replace') as f:
+                    lines.extend(f)
+            except OSError:
+                continue
+        rules = cls(lines)
+        if rules.dir_regex is None:
+            return None
+        return rules
+    
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """Return True if rel_path is ignored, False if re-included, None if no pattern matches.
+        
+        rel_path is relative to the directory of the ignore files, with '/' separators.
+        """
+        regex = self.dir_regex if is_dir else self.file_regex
+        if regex is None:
+            return None
+        match = regex.fullmatch(rel_path)
+        if match is None:
+            return None
+        return match.lastgroup not in self.negated
+
+
+class FileResult:
+    """Outcome of processing a single file.
+    
+    Produced by the per-file workers (in-process or in a worker process) and
+    merged into the run totals by the parent, which does all the reporting.
+    """
+    
+    __slots__ = ('path', 'count', 'findings', 'modified', 'error', 'cached', 'skipped', 'stats', 'members')
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self.count = 0
+        self.findings = []  # Per-match detail tuples, mode specific
+        self.modified = False
+        self.error = None  # Warning message if the file could not be processed
+        self.cached = False  # Loaded from the scan cache rather than computed
+        self.skipped = False  # Not a text file, so not processed or counted
+        self.stats = None  # FileStats with --stats
+        self.members = None  # One FileResult per scanned member, for archives (see --archives)
+
+
+class CharsetFindings:
+    """Compact store of one file's character set violations.
+    
+    Codepoints, lines and columns are kept in typed arrays of 32-bit items
+    (12 bytes per violation) instead of a tuple each, and the (char,
+    codepoint, line, col, context) tuples consumers iterate over are only
+    built on demand.
+    ``histogram`` counts every violating character, including those beyond
+    --max-findings-per-file and those of runs that keep no details.
+    """
+    
+    __slots__ = ('codepoints', 'lines', 'columns', 'contexts', 'histogram')
+    
+    def __init__(self):
+        self.codepoints = array.array('I')
+        self.lines = array.array('I')
+        self.columns = array.array('I')
+        self.contexts = []
+        self.histogram = Counter()  # char -> count
+    
+    def append(self, codepoint: int, line: int, column: int, context: str):
+        self.codepoints.append(codepoint)
+        self.lines.append(line)
+        self.columns.append(column)
+        self.contexts.append(context)
+    
+    def __len__(self) -> int:
+        return len(self.codepoints)
+    
+    def __iter__(self) -> Iterator[Tuple[str, int, int, int, str]]:
+        for codepoint, line, column, context in zip(self.codepoints, self.lines, self.columns, self.contexts):
+            yield chr(codepoint), codepoint, line, column, context
+    
+    def to_json(self) -> dict:
+        return {'histogram': self.histogram, 'findings': [self.codepoints.tolist(), self.lines.tolist(),
+                                                          self.columns.tolist(), self.contexts]}
+    
+    @classmethod
+    def from_json(cls, data: dict) -> 'CharsetFindings':
+        findings = cls()
+        findings.histogram.update(data['histogram'])
+        codepoints, lines, columns, contexts = data['findings']
+        findings.codepoints.extend(codepoints)
+        findings.lines.extend(lines)
+        findings.columns.extend(columns)
+        findings.contexts = contexts
+        return findings
+
+
+def _timed_call(add: Callable[[str, float, float], None], phase: str, function: Callable) -> Callable:
+    """Wrap function so that each call reports its (wall, cpu) seconds through add(phase, ...)."""
+    def wrapper(*args, **kwargs):
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            add(phase, time.perf_counter() - wall, time.process_time() - cpu)
+    return wrapper
+
+
+class FileStats:
+    """Timings and byte counts of processing a single file (see --stats).
+    
+    ``phases`` maps a phase name to its [wall, cpu] seconds. Only match and
+    write are timed directly; read (opening, sniffing, reading and
+    decoding) is the rest of the file's time.
+    """
+    
+    __slots__ = ('wall', 'cpu', 'phases', 'bytes_read', 'bytes_written')
+    
+    def __init__(self):
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.phases = {}
+        self.bytes_read = 0
+        self.bytes_written = 0
+    
+    def add(self, phase: str, wall: float, cpu: float):
+        totals = self.phases.setdefault(phase, [0.0, 0.0])
+        totals[0] += wall
+        totals[1] += cpu
+    
+    def timed(self, phase: str, function: Callable) -> Callable:
+        """Wrap function so that the time spent in it is added to phase."""
+        return _timed_call(self.add, phase, function)
+
+
+class RunStats:
+    """Phase timings, byte counts, file outcomes and the slowest files of a run (see --stats).
+    
+    Run phases (traversal, cache, report) are timed in the parent process;
+    the per-file phases (read, match, write) are summed over all files,
+    wherever they were processed. Total CPU time includes worker processes.
+    """
+    
+    PHASES = ('traversal', 'cache', 'read', 'match', 'write', 'report')
+    
+    def __init__(self, slowest: int):
+        self.slowest = slowest
+        self.phases = {phase: [0.0, 0.0] for phase in self.PHASES}
+        self.outcomes = dict.fromkeys(('clean', 'findings', 'modified', 'skipped', 'cached', 'error'), 0)
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self._slowest = []  # Min-heap of (wall, sequence, path)
+        self._start_wall = time.perf_counter()
+        self._start_times = os.times()
+    
+    def add(self, phase: str, wall: float, cpu: float):
+        totals = self.phases[phase]
+        totals[0] += wall
+        totals[1] += cpu
+    
+    def timed_call(self, phase: str, function: Callable) -> Callable:
+        """Wrap function so that the time spent in it is added to phase."""
+        return _timed_call(self.add, phase, function)
+    
+    def timed(self, items: Iterable, phase: str) -> Iterator:
+        """Yield from items, adding the time spent producing each item to phase."""
+        items = iter(items)
+        while True:
+            wall, cpu = time.perf_counter(), time.process_time()
+            try:
+                item = next(items)
+            except StopIteration:
+                return
+            finally:
+                self.add(phase, time.perf_counter() - wall, time.process_time() - cpu)
+            yield item
+    
+    def timed_results(self, results: Iterable[FileResult]) -> Iterator[FileResult]:
+        """Record each result, and add the time the consumer spends on it to the report phase."""
+        for result in results:
+            self.add_file(result)
+            wall, cpu = time.perf_counter(), time.process_time()
+            yield result
+            self.add('report', time.perf_counter() - wall, time.process_time() - cpu)
+    
+    def add_file(self, result: FileResult):
+        if result.error:
+            outcome = 'error'
+        elif result.skipped:
+            outcome = 'skipped'
+        elif result.cached:
+            outcome = 'cached'
+        elif result.modified:
+            outcome = 'modified'
+        else:
+            outcome = 'findings' if result.count else 'clean'
+        self.outcomes[outcome] += 1
+        
+        stats = result.stats
+        if stats is None:
+            return
+        for phase, (wall, cpu) in stats.phases.items():
+            self.add(phase, wall, cpu)
+        self.bytes_read += stats.bytes_read
+        self.bytes_written += stats.bytes_written
+        entry = (stats.wall, sum(self.outcomes.values()), str(result.path))
+        if len(self._slowest) < self.slowest:
+            heapq.heappush(self._slowest, entry)
+        elif self.slowest:
+            heapq.heappushpop(self._slowest, entry)
+    
+    def summary(self) -> dict:
+        """Return the statistics as a JSON-serializable dict."""
+        end = os.times()
+        start = self._start_times
+        cpu = sum(end[:4]) - sum(start[:4])  # user + system, own and of reaped workers
+        return {
+            'wall': time.perf_counter() - self._start_wall,
+            'cpu': cpu,
+            'phases': {phase: {'wall': wall, 'cpu': cpu} for phase, (wall, cpu) in self.phases.items()},
+            'bytes_read': self.bytes_read,
+            'bytes_written': self.bytes_written,
+            'files': dict(self.outcomes),
+            'slowest': [{'path': path, 'wall': wall} for wall, _, path in sorted(self._slowest, reverse=True)],
+        }
+    
+    @staticmethod
+    def format_table(summary: dict) -> str:
+        """Render a summary() dict as a plain-text table."""
+        lines = [f"{'Phase':<12}{'Wall (s)':>12}{'CPU (s)':>12}"]
+        for phase, times in summary['phases'].items():
+            lines.append(f"{phase:<12}{times['wall']:>12.3f}{times['cpu']:>12.3f}")
+        lines.append(f"{'total':<12}{summary['wall']:>12.3f}{summary['cpu']:>12.3f}")
+        lines.append("(read, match and write are summed over files; total CPU includes workers)")
+        lines.append(f"Bytes read: {summary['bytes_read']}, written: {summary['bytes_written']}")
+        lines.append("Files: " + ', '.join(f"{count} {outcome}" for outcome, count in summary['files'].items()))
+        if summary['slowest']:
+            lines.append("Slowest files:")
+            lines.extend(f"{entry['wall']:>10.4f}s  {entry['path']}" for entry in summary['slowest'])
+        return '\n'.join(lines)
+
+
+class ScanCache:
+    """On-disk cache of per-file scan results, backed by SQLite.
+    
+    Entries are keyed by resolved path and scan mode, and are valid while the
+    file's size, mtime_ns and inode are unchanged. With ``use_hash`` a BLAKE2b
+    digest of the content is stored too, so files whose metadata changed but
+    whose content did not (e.g. a fresh CI checkout) still hit. Emoji modes
+    carry the emoji data version in their mode string, so upgrading the emoji
+    library invalidates them.
+    
+    Lookups read the database directly; new entries and hit timestamps are
+    kept in memory and written by close() in a single transaction, which also
+    evicts least recently used entries beyond ``max_bytes``. SQLite's locking
+    (with a generous busy timeout) keeps parallel jobs sharing one cache file
+    from corrupting it.
+    """
+    
+    FORMAT = 3
+    # Rough per-row storage cost on top of the stored findings
+    ROW_OVERHEAD = 128
+    
+    def __init__(self, path: str, max_bytes: int, use_hash: bool = False):
+        import sqlite3
+        
+        self.max_bytes = max_bytes
+        self.use_hash = use_hash
+        self.hits = 0
+        self.misses = 0
+        self._pending = {}  # (path, mode) -> row tuple to write on close
+        self._touched = []  # (path, mode) of hits, to refresh last_used
+        self._moved = []  # (size, mtime_ns, inode, path, mode) of hits found by digest only
+        self._stats = {}  # path -> (size, mtime_ns, inode, digest) seen by lookup
+        self._connection = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS entries ('
+            ' path TEXT NOT NULL, mode TEXT NOT NULL,'
+            ' size INTEGER, mtime_ns INTEGER, inode INTEGER, digest TEXT,'
+            ' detailed INTEGER, count INTEGER, findings TEXT,'
+            ' bytes INTEGER, last_used REAL,'
+            ' PRIMARY KEY (path, mode))'
+        )
+        self._connection.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+        row = self._connection.execute("SELECT value FROM meta WHERE key = 'format'").fetchone()
+        if row is None or row[0] != str(self.FORMAT):
+            with self._transaction():
+                self._connection.execute('DELETE FROM entries')
+                self._connection.execute("INSERT OR REPLACE INTO meta VALUES ('format', ?)", (str(self.FORMAT),))
+    
+    @contextlib.contextmanager
+    def _transaction(self):
+        """Run a write transaction that takes the database lock up front."""
+        self._connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield
+        except BaseException:
+            self._connection.execute('ROLLBACK')
+            raise
+        self._connection.execute('COMMIT')
+    
+    @staticmethod
+    def _digest(file_path: Path) -> str:
+        """Return the BLAKE2b digest of a file's content."""
+        import hashlib
+        
+        digest = hashlib.blake2b(digest_size=20)
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(STREAM_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    def lookup(self, file_path: Path, mode: str, detailed: bool) -> Optional[FileResult]:
+        """Return the cached result for a file, or None if it must be scanned.
+        
+        A ``detailed`` lookup (verbose run) only accepts entries that carry
+        per-finding details, or that have no findings at all.
+        """
+        key = str(file_path.resolve())
+        try:
+            file_stat = file_path.stat()
+        except OSError:
+            return None
+        size, mtime_ns, inode = file_stat.st_size, file_stat.st_mtime_ns, file_stat.st_ino
+        
+        row = self._connection.execute(
+            'SELECT size, mtime_ns, inode, digest, detailed, count, findings FROM entries WHERE path = ? AND mode = ?',
+            (key, mode)
+        ).fetchone()
+        
+        digest = None
+        metadata_hit = hit = row is not None and (row[0], row[1], row[2]) == (size, mtime_ns, inode)
+        if row is not None:
+            digest = row[3]
+        if self.use_hash and not hit:
+            try:
+                digest = self._digest(file_path)
+            except OSError:
+                return None
+            hit = row is not None and row[3] == digest
+        self._stats[key] = (size, mtime_ns, inode, digest)
+        
+        if not hit or (detailed and row[5] and not row[4]):
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        self._touched.append((key, mode))
+        if not metadata_hit:
+            # Record the new metadata so the next run hits without hashing
+            self._moved.append((size, mtime_ns, inode, key, mode))
+        result = FileResult(file_path)
+        result.count = row[5]
+        findings = json.loads(row[6])
+        if isinstance(findings, dict):
+            result.findings = CharsetFindings.from_json(findings)
+        else:
+            result.findings = [tuple(finding) for finding in findings]
+        result.cached = True
+        return result
+    
+    def store(self, result: FileResult, mode: str, detailed: bool):
+        """Queue a freshly computed result for writing on close()."""
+        key = str(result.path.resolve())
+        stats = self._stats.get(key)
+        if stats is None or result.error or result.skipped:
+            return
+        findings = result.findings
+        if isinstance(findings, CharsetFindings):
+            findings = findings.to_json()
+        findings = json.dumps(findings, ensure_ascii=False, separators=(',', ':'))
+        row_bytes = len(findings) + len(key) + self.ROW_OVERHEAD
+        self._pending[(key, mode)] = (key, mode, *stats, int(detailed), result.count, findings, row_bytes)
+    
+    def close(self):
+        """Write queued entries, refresh hit timestamps and evict down to max_bytes."""
+        try:
+            now = time.time()
+            with self._transaction():
+                self._connection.executemany(
+                    'INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (row + (now,) for row in self._pending.values())
+                )
+                self._connection.executemany(
+                    'UPDATE entries SET last_used = ? WHERE path = ? AND mode = ?',
+                    ((now, key, mode) for key, mode in self._touched)
+                )
+                self._connection.executemany(
+                    'UPDATE entries SET size = ?, mtime_ns = ?, inode = ? WHERE path = ? AND mode = ?',
+                    self._moved
+                )
+                
+                # Least recently used entries go first once over the size budget
+                total = self._connection.execute('SELECT COALESCE(SUM(bytes), 0) FROM entries').fetchone()[0]
+                if total > self.max_bytes:
+                    excess = total - self.max_bytes
+                    stale = []
+                    for rowid, row_bytes in self._connection.execute('SELECT rowid, bytes FROM entries ORDER BY last_used'):
+                        if excess <= 0:
+                            break
+                        stale.append((rowid,))
+                        excess -= row_bytes
+                    self._connection.executemany('DELETE FROM entries WHERE rowid = ?', stale)
+        finally:
+            self._pending.clear()
+            self._touched.clear()
+            self._connection.close()
+
+
+class FindingReporter:
+    """Writes one record per finding to a file or stdout (see --format).
+    
+    Records bypass logging entirely and go through a large write buffer, so
+    reporting costs about one string format per finding. A record is a dict
+    with path, line, column, rule and context, plus codepoint for charset
+    findings; a ``truncated`` record marks a file whose findings were capped
+    by --max-findings-per-file.
+    """
+    
+    def __init__(self, output: Optional[str] = None):
+        self._owns_stream = True
+        if output:
+            self._stream = open(output, 'w', encoding='utf-8', buffering=REPORT_BUFFER_SIZE)
+        else:
+            try:
+                self._stream = open(sys.stdout.fileno(), 'w', encoding='utf-8', buffering=REPORT_BUFFER_SIZE,
+                                    closefd=False)
+            except (AttributeError, io.UnsupportedOperation):
+                # stdout is not a file, e.g. captured by the --serve daemon
+                self._stream = sys.stdout
+                self._owns_stream = False
+        self._start()
+    
+    @staticmethod
+    def create(fmt: str, output: Optional[str] = None) -> 'FindingReporter':
+        """Return the reporter for a --format name."""
+        reporters = {'text': TextReporter, 'jsonl': JsonLinesReporter, 'sarif': SarifReporter}
+        return reporters[fmt](output)
+    
+    def _start(self):
+        """Write whatever precedes the first record."""
+    
+    def _finish(self):
+        """Write whatever follows the last record."""
+    
+    def write(self, record: dict):
+        raise NotImplementedError
+    
+    def truncated(self, path: Path, total: int, reported: int):
+        """Note that only the first ``reported`` of a file's ``total`` findings were written."""
+    
+    def close(self):
+        """Finish the output and flush it."""
+        try:
+            self._finish()
+        finally:
+            if self._owns_stream:
+                self._stream.close()
+            else:
+                self._stream.flush()
+
+
+class TextReporter(FindingReporter):
+    """Compiler-style ``path:line:col: rule: context`` lines."""
+    
+    def write(self, record: dict):
+        codepoint = f" {record['codepoint']}" if 'codepoint' in record else ''
+        self._stream.write(f"{record['path']}:{record['line']}:{record['column']}: "
+                           f"{record['rule']}{codepoint}: {record['context']}\n")
+    
+    def truncated(self, path: Path, total: int, reported: int):
+        self._stream.write(f"{path}: {total - reported} more finding(s) not shown\n")
+
+
+class JsonLinesReporter(FindingReporter):
+    """One JSON object per line."""
+    
+    def write(self, record: dict):
+        self._stream.write(json.dumps(record, ensure_ascii=False))
+        self._stream.write('\n')
+    
+    def truncated(self, path: Path, total: int, reported: int):
+        self.write({'path': str(path), 'truncated': True, 'total': total, 'reported': reported})
+
+
+class SarifReporter(FindingReporter):
+    """A SARIF 2.1.0 log with one run, streamed result by result."""
+    
+    def _start(self):
+        rules = [{'id': rule, 'shortDescription': {'text': text}} for rule, text in REPORT_RULES.items()]
+        head = json.dumps({
+            'version': '2.1.0',
+            '$schema': 'https://json.schemastore.org/sarif-2.1.0.json',
+            'runs': [{
+                'tool': {'driver': {'name': 'nomoemo', 'version': '0.0.1', 'rules': rules}},
+                'columnKind': 'unicodeCodePoints',
+                'results': [],
+            }],
+        }, ensure_ascii=False)
+        # Stream the results into the (empty, last) results array
+        self._stream.write(head[:-len(']}]}')])
+        self._separator = ''
+    
+    def _finish(self):
+        self._stream.write(']}]}\n')
+    
+    def write(self, record: dict):
+        message = REPORT_RULES[record['rule']]
+        if 'codepoint' in record:
+            message = f"{message}: {record['codepoint']}"
+        result = {
+            'ruleId': record['rule'],
+            'level': 'warning',
+            'message': {'text': message},
+            'locations': [{'physicalLocation': {
+                'artifactLocation': {'uri': Path(record['path']).as_posix()},
+                'region': {'startLine': record['line'], 'startColumn': record['column'],
+                           'snippet': {'text': record['context']}},
+            }}],
+        }
+        self._stream.write(self._separator)
+        self._stream.write(json.dumps(result, ensure_ascii=False))
+        self._separator = ','
+
+
+# Per-process NoMoEmo instance used by --jobs worker processes
+_worker_app = None
+
+
+def _init_worker(args):
+    """Process pool initializer: build the worker-local NoMoEmo instance."""
+    global _worker_app
+    _worker_app = NoMoEmo(args, worker=True)
+
+
+def _run_worker_batch(method_name: str, files: List[Path], extra: Tuple) -> List[FileResult]:
+    """Run a per-file NoMoEmo method over a batch of files inside a worker process."""
+    method = _worker_app._file_method(method_name)
+    return [method(file_path, *extra) for file_path in files]
 
 
 class NoMoEmo:
     """Main class for emoji detection and elimination."""
     
-    def __init__(self, args):
-        """Initialize NoMoEmo with command line arguments."""
+    def __init__(self, args: Optional[argparse.Namespace] = None, worker: bool = False, **options):
+        """Initialize NoMoEmo with command line arguments.
+        
+        Without args, the defaults of a plain command line run are used, with
+        options overriding them by destination name (see default_args).
+        Worker instances (used by --jobs and the library API) only process
+        files and never log, so they skip handler setup to avoid clobbering
+        the --log file.
+        """
+        if args is None:
+            args = default_args(**options)
+        elif options:
+            raise TypeError("options cannot be combined with args")
         self.args = args
-        self.logger = self._setup_logging()
+        self.logger = logging.getLogger('nomoemo.worker') if worker else self._setup_logging()
         self.emoji_count = 0
         self.files_processed = 0
         self.files_with_emojis = 0
         
         # Character set violation tracking
         self.files_with_charset_violations = 0
-        self.charset_violations = []  # List of (file_path, char, codepoint, line, col) tuples
+        self.charset_violation_count = 0
+        self.charset_histogram = Counter()  # Violating char -> count over the run
+        self.charset_violations_by_file = {}  # Path -> count, for files with violations
+        
+        # Per-finding details are collected for verbose output and --format reporters
+        self.detailed = bool(args.verbose or args.format or args.watch)
+        self.max_findings = args.max_findings_per_file  # None = no cap
+        self.reporter = None  # FindingReporter when --format is given
         
-        self.emoji_regex = self._build_emoji_regex()
+        # Run statistics are gathered by the parent; workers only time their files
+        self.stats = RunStats(args.stats_slowest) if args.stats and not worker else None
+        self._file_stats = None  # FileStats of the file being processed, with --stats
         
-    def _build_emoji_regex(self) -> re.Pattern:
-        """Build a comprehensive regex pattern for detecting all Unicode emojis."""
-        # Sort emoji by length (descending) to match multi-character emojis first
-        emojis = sorted(emoji.EMOJI_DATA.keys(), key=len, reverse=True)
-        pattern = '(' + '|'.join(re.escape(u) for u in emojis) + ')'
-        return re.compile(pattern, re.UNICODE)
+        self.cache = None  # ScanCache when --cache is given
+        # The --cache database and its SQLite side files are never scanned (see _is_cache_file)
+        self._cache_names = frozenset()
+        self._cache_paths = frozenset()
+        if args.cache:
+            cache_dir, cache_name = os.path.split(os.path.abspath(args.cache))
+            self._cache_names = frozenset(cache_name + suffix for suffix in ('', '-journal', '-wal', '-shm'))
+            self._cache_paths = frozenset(os.path.join(os.path.realpath(cache_dir), name)
+                                          for name in self._cache_names)
+        
+        # Suffix allow/deny sets; an explicitly included suffix overrides the default deny list
+        self.include_suffixes = frozenset(args.include_ext) if args.include_ext else None
+        default_skip = DEFAULT_SKIP_SUFFIXES if args.archives else DEFAULT_SKIP_SUFFIXES | ARCHIVE_SUFFIXES
+        self.skip_suffixes = (default_skip - (self.include_suffixes or frozenset())) | frozenset(args.exclude_ext or ())
+    
+    @property
+    def emoji_matcher(self) -> EmojiMatcher:
+        """The process-wide EmojiMatcher, loaded on first use so that charset modes never load it."""
+        return get_emoji_matcher()
     
     def _setup_logging(self) -> logging.Logger:
         """Set up logging based on command line arguments."""
@@ -92,16 +1350,26 @@ class NoMoEmo:
             if not self._validate_arguments():
                 return 1
             
+            if self.args.stdin or self.args.target == '-':
+                return self._run_stdin()
+            
             # Process target path
             target_path = Path(self.args.target)
             if not target_path.exists():
                 self.logger.error(f"Target path does not exist: {target_path}")
                 return 1
             
-            # Get list of files to process
-            files_to_process = self._get_files_to_process(target_path)
+            # Get the files to process; directory traversal is lazy
+            if self.args.changed_since or self.args.staged:
+                files_to_process = self._get_changed_files(target_path)
+                if files_to_process is None:
+                    return 1
+            else:
+                files_to_process = self._get_files_to_process(target_path)
             
-            if not files_to_process:
+            files_to_process = iter(files_to_process)
+            first_file = next(files_to_process, None)
+            if first_file is None and not self.args.watch:
                 if not self.args.quiet:
                     self.logger.info("No files found to process.")
                 return 0
@@ -109,20 +1377,26 @@ class NoMoEmo:
             if not self.args.quiet:
                 self.logger.info(f"Scanning for emoji...")
             
-            # Process files based on mode
-            if self.args.dry_run:
-                return self._dry_run_mode(files_to_process)
-            elif self.args.remove:
-                return self._remove_mode(files_to_process)
-            elif self.args.replace:
-                return self._replace_mode(files_to_process)
-            elif self.args.ascii_only:
-                return self._ascii_only_mode(files_to_process)
-            elif self.args.latin1_only:
-                return self._latin1_only_mode(files_to_process)
-            else:
-                # Default to dry run if no action specified
-                return self._dry_run_mode(files_to_process)
+            if self.args.cache:
+                import sqlite3
+                try:
+                    self.cache = ScanCache(self.args.cache, self.args.cache_size, self.args.cache_hash)
+                except sqlite3.Error as e:
+                    self.logger.warning(f"Could not open cache '{self.args.cache}', continuing without it: {e}")
+            
+            if not self._open_reporter():
+                self._close_cache()
+                return 1
+            
+            try:
+                if self.args.watch:
+                    return self._watch(target_path)
+                return self._run_mode(itertools.chain([first_file], files_to_process))
+            finally:
+                self._close_cache()
+                self._close_reporter()
+                if self.stats is not None:
+                    self._print_stats()
                 
         except KeyboardInterrupt:
             if not self.args.quiet:
@@ -132,6 +1406,55 @@ class NoMoEmo:
             self.logger.error(f"Unexpected error: {e}")
             return 1
     
+    def _run_mode(self, files_to_process: Iterable[Path]) -> int:
+        """Process files based on mode."""
+        if self.args.dry_run:
+            return self._dry_run_mode(files_to_process)
+        elif self.args.remove:
+            return self._remove_mode(files_to_process)
+        elif self.args.replace:
+            return self._replace_mode(files_to_process)
+        elif self.args.ascii_only:
+            return self._ascii_only_mode(files_to_process)
+        elif self.args.latin1_only:
+            return self._latin1_only_mode(files_to_process)
+        else:
+            # Default to dry run if no action specified
+            return self._dry_run_mode(files_to_process)
+    
+    def _close_cache(self):
+        """Flush and close the scan cache, if one is open."""
+        if self.cache is None:
+            return
+        import sqlite3
+        
+        cache, self.cache = self.cache, None
+        try:
+            cache.close()
+            self.logger.debug(f"Cache: {cache.hits} hits, {cache.misses} misses")
+        except sqlite3.Error as e:
+            self.logger.warning(f"Could not update cache '{self.args.cache}': {e}")
+    
+    def _open_reporter(self) -> bool:
+        """Open the --format reporter, if any; False (after logging) if its output cannot be opened."""
+        if self.args.format:
+            try:
+                self.reporter = FindingReporter.create(self.args.format, self.args.output)
+            except OSError as e:
+                self.logger.error(f"Could not open output file '{self.args.output}': {e}")
+                return False
+        return True
+    
+    def _close_reporter(self):
+        """Finish and flush the --format output, if any."""
+        if self.reporter is None:
+            return
+        reporter, self.reporter = self.reporter, None
+        try:
+            reporter.close()
+        except OSError as e:
+            self.logger.warning(f"Could not write output: {e}")
+    
     def _validate_arguments(self) -> bool:
         """Validate command line arguments."""
         # Will be expanded in Task 10
@@ -155,72 +1478,375 @@ class NoMoEmo:
                 return False
             
             # Check if replacement character is an emoji (would be counterproductive)
-            if emoji.emoji_list(self.args.replacement):
+            if self.emoji_matcher.find_spans(self.args.replacement):
                 self.logger.error("--replacement cannot be an emoji character")
                 return False
         
+        if self.args.jobs < 0:
+            self.logger.error("--jobs must be 0 (one per CPU) or a positive number")
+            return False
+        
+        if self.args.format and (self.args.remove or self.args.replace):
+            self.logger.error("--format can only be used with --dry-run, --ascii-only or --latin1-only")
+            return False
+        
+        if self.args.output and not self.args.format:
+            self.logger.error("--output requires --format")
+            return False
+        
+        if self.args.max_findings_per_file is not None and self.args.max_findings_per_file < 1:
+            self.logger.error("--max-findings-per-file must be a positive number")
+            return False
+        
+        if self.args.watch:
+            if self.args.remove or self.args.replace or self.args.format:
+                self.logger.error("--watch can only be used with --dry-run, --ascii-only or --latin1-only, without --format")
+                return False
+            if self.args.changed_since or self.args.staged:
+                self.logger.error("--watch cannot be combined with --changed-since or --staged")
+                return False
+        if self.args.archives:
+            if self.args.remove or self.args.replace or self.args.watch:
+                self.logger.error("--archives can only be used with --dry-run, --ascii-only or --latin1-only, without --watch")
+                return False
+            if self.args.archive_max_members < 1:
+                self.logger.error("--archive-max-members must be a positive number")
+                return False
+        
+        if self.args.stdin or self.args.target == '-':
+            if self.args.stdin and self.args.target is not None:
+                self.logger.error("--stdin takes no target")
+                return False
+            if self.args.watch or self.args.changed_since or self.args.staged:
+                self.logger.error("Standard input cannot be combined with --watch, --changed-since or --staged")
+                return False
+        if self.args.watch_interval <= 0 or self.args.watch_debounce < 0:
+            self.logger.error("--watch-interval must be positive and --watch-debounce not negative")
+            return False
+        
         return True
     
-    def _get_files_to_process(self, target_path: Path) -> List[Path]:
-        """Get list of files to process based on target path and options."""
-        # Will be implemented in Task 4
-        files = []
-        
+    def _get_files_to_process(self, target_path: Path) -> Iterator[Path]:
+        """Yield the files to process based on target path and options."""
         if target_path.is_file():
-            files.append(target_path)
+            yield target_path
         elif target_path.is_dir():
-            if self.args.recursive:
-                # Recursive directory traversal
-                for file_path in target_path.rglob('*'):
-                    if file_path.is_file() and self._should_process_file(file_path):
-                        files.append(file_path)
-            else:
-                # Single directory level
-                for file_path in target_path.iterdir():
-                    if file_path.is_file() and self._should_process_file(file_path):
-                        files.append(file_path)
+            for file_path in self._walk_directory(target_path):
+                if self._should_process_file(file_path) and not self._is_cache_file(file_path):
+                    yield file_path
+    
+    def _walk_directory(self, root: Path) -> Iterator[Path]:
+        """Yield the files under root, depth first with entries sorted by name.
+        
+        Uses os.scandir so file types come from the directory listing instead of
+        a stat per entry. Excluded and ignored directories are pruned without
+        being listed, ignored files are never opened, and directories reached
+        through symlinks are entered only once (by device and inode), so
+        symlink loops cannot recurse forever.
+        """
+        excluded = set() if self.args.no_default_excludes else set(DEFAULT_EXCLUDE_DIRS)
+        excluded.update(self.args.exclude_dir or ())
+        use_ignore_files = not self.args.no_ignore
+        
+        visited = set()
+        try:
+            root_stat = root.stat()
+            visited.add((root_stat.st_dev, root_stat.st_ino))
+        except OSError:
+            pass
+        
+        # Each stack entry carries its path relative to root and the chain of
+        # ignore rules in effect, as (rules, lead, strip) with the path
+        # relative to the rules' directory being lead + rel_path[strip:]
+        stack = [(root, '', self._ancestor_ignore_rules(root) if use_ignore_files else ())]
+        while stack:
+            directory, prefix, chain = stack.pop()
+            try:
+                with os.scandir(directory) as it:
+                    entries = sorted(it, key=lambda entry: entry.name)
+            except OSError as e:
+                self.logger.debug(f"Skipping unreadable directory {directory}: {e}")
+                continue
+            
+            if use_ignore_files:
+                names = {entry.name for entry in entries if entry.name in IGNORE_FILE_NAMES}
+                if names:
+                    rules = IgnoreRules.from_directory(directory, names)
+                    if rules is not None:
+                        chain = chain + ((rules, '', len(prefix)),)
+            
+            subdirs = []
+            for entry in entries:
+                rel_path = prefix + entry.name
+                try:
+                    if entry.is_file():
+                        if not (chain and self._is_ignored(chain, rel_path, False)):
+                            yield directory / entry.name
+                    elif self.args.recursive and entry.is_dir() and entry.name not in excluded:
+                        if chain and self._is_ignored(chain, rel_path, True):
+                            continue
+                        entry_stat = os.stat(entry.path)
+                        key = (entry_stat.st_dev, entry_stat.st_ino)
+                        if key in visited:
+                            self.logger.debug(f"Skipping already visited directory {entry.path}")
+                            continue
+                        visited.add(key)
+                        subdirs.append((directory / entry.name, rel_path + '/', chain))
+                except OSError:
+                    continue
+            
+            # Reversed so the first subdirectory is popped (and listed) next
+            stack.extend(reversed(subdirs))
+    
+    @staticmethod
+    def _is_ignored(chain: Tuple, rel_path: str, is_dir: bool) -> bool:
+        """Decide whether rel_path is ignored; the deepest ignore file with a matching pattern wins."""
+        for rules, lead, strip in reversed(chain):
+            verdict = rules.match(lead + rel_path[strip:], is_dir)
+            if verdict is not None:
+                return verdict
+        return False
+    
+    def _ancestor_ignore_rules(self, root: Path) -> Tuple:
+        """Ignore rules from the directories above root, up to the enclosing git work tree.
+        
+        Outside a git work tree only the ignore files under root apply.
+        """
+        try:
+            root = root.resolve()
+        except OSError:
+            return ()
+        if (root / '.git').exists():
+            return ()
+        ancestors = []
+        for directory in root.parents:
+            ancestors.append(directory)
+            if (directory / '.git').exists():
+                break
+        else:
+            return ()
+        
+        chain = ()
+        for directory in reversed(ancestors):
+            rules = IgnoreRules.from_directory(directory)
+            if rules is not None:
+                chain += ((rules, root.relative_to(directory).as_posix() + '/', 0),)
+        return chain
+    
+    def _git(self, cwd: Path, *git_args: str) -> Optional[str]:
+        """Run a git command, returning its output or None (after logging) on failure."""
+        import subprocess
+        
+        try:
+            completed = subprocess.run(
+                ['git', *git_args], cwd=cwd, capture_output=True, text=True, encoding='utf-8', check=True
+            )
+        except FileNotFoundError:
+            self.logger.error("git is required for --changed-since/--staged but was not found")
+            return None
+        except subprocess.CalledProcessError as e:
+            self.logger.error(f"git {git_args[0]} failed: {e.stderr.strip()}")
+            return None
+        return completed.stdout
+    
+    def _get_changed_files(self, target_path: Path) -> Optional[List[Path]]:
+        """Get the files under target_path that git reports as changed.
+        
+        With --staged these are the added, copied, modified or renamed files in
+        the index; with --changed-since REF, those that differ between REF and
+        the working tree. Returns None if git could not answer.
+        """
+        target_path = target_path.resolve()
+        cwd = target_path if target_path.is_dir() else target_path.parent
+        toplevel = self._git(cwd, 'rev-parse', '--show-toplevel')
+        if toplevel is None:
+            return None
         
+        diff_args = ['diff', '--name-only', '-z', '--no-renames', '--diff-filter=ACMR']
+        if self.args.staged:
+            diff_args.append('--cached')
+        else:
+            diff_args.append(self.args.changed_since)
+        output = self._git(cwd, *diff_args, '--', str(target_path))
+        if output is None:
+            return None
+        
+        root = Path(toplevel.strip())
+        given_path = Path(self.args.target)
+        files = []
+        for name in output.split('\0'):
+            if not name:
+                continue
+            file_path = root / name
+            if target_path.is_dir():
+                # Without --recursive only files directly in a target directory count
+                if not self.args.recursive and file_path.parent != target_path:
+                    continue
+                # Report paths the way directory traversal does, under the target as given
+                file_path = given_path / file_path.relative_to(target_path)
+            else:
+                file_path = given_path
+            if file_path.is_file() and self._should_process_file(file_path) and not self._is_cache_file(file_path):
+                files.append(file_path)
         return files
     
-    def _should_process_file(self, file_path: Path) -> bool:
-        """Determine if a file should be processed."""
-        # Skip files that are obviously not text
-        if file_path.suffix.lower() in {'.exe', '.dll', '.so', '.dylib', '.bin', '.jpg', '.png', '.gif', '.bmp', '.mp4', '.avi', '.zip', '.tar', '.gz', '.pdf'}:
+    def _is_cache_file(self, file_path: Path) -> bool:
+        """Tell whether a file is the --cache database or its journal, WAL or shared memory file.
+        
+        A cache kept inside the scanned tree would otherwise be scanned, and
+        its transient journal reported as vanished by parallel runs. Only
+        files with one of those names are resolved.
+        """
+        if file_path.name not in self._cache_names:
             return False
+        return os.path.join(os.path.realpath(file_path.parent), file_path.name) in self._cache_paths
+    
+    def _should_process_file(self, file_path: Path) -> bool:
+        """Decide from the file name alone whether a file should be processed.
         
-        try:
-            # Read first 1024 bytes to check for binary content
-            with open(file_path, 'rb') as f:
-                chunk = f.read(1024)
-                
-                # Check for null bytes (common in binary files)
-                if b'\x00' in chunk:
-                    return False
-                
-                # Try to decode as UTF-8
-                try:
-                    chunk.decode('utf-8')
-                    return True
-                except UnicodeDecodeError:
-                    # If it fails UTF-8 decoding, it's likely binary
-                    return False
-                    
-        except (OSError, IOError):
-            # Can't read the file, skip it
+        Nothing is opened here: the per-file readers tell binary files from
+        text by the first bytes they read anyway (see _classify_text).
+        """
+        suffix = file_path.suffix.lower()
+        if suffix in self.skip_suffixes:
             return False
+        if self.args.archives and _archive_kind(file_path.name):
+            return True  # --include-ext selects the members
+        return self.include_suffixes is None or suffix in self.include_suffixes
+    
+    def _map_files(self, method_name: str, files: Iterable[Path], *extra) -> Iterator[FileResult]:
+        """Apply a per-file method to every file, yielding results in input order.
+        
+        With --stats, traversal (pulling files from the iterator) and the
+        caller's handling of each result are timed as well.
+        """
+        if self.stats is None:
+            return self._map_cached_files(method_name, files, *extra)
+        files = self.stats.timed(files, 'traversal')
+        return self.stats.timed_results(self._map_cached_files(method_name, files, *extra))
     
-    def _dry_run_mode(self, files: List[Path]) -> int:
+    def _map_cached_files(self, method_name: str, files: Iterable[Path], *extra) -> Iterator[FileResult]:
+        """Apply a per-file method to every file, passing through valid cached results.
+        
+        With --cache, files with a valid cached result are not processed at
+        all; rewrites can only skip files known to be emoji free.
+        """
+        if self.cache is None:
+            yield from self._run_files(method_name, ((file_path, None) for file_path in files), *extra)
+            return
+        
+        if method_name == '_scan_file_for_charset_violations':
+            mode = extra[0]
+        else:
+            mode = f'emoji@{self.emoji_matcher.version}'
+        rewriting = method_name == '_rewrite_file'
+        detailed = self.detailed and not rewriting
+        
+        lookup = self.cache.lookup
+        if self.stats is not None:
+            lookup = self.stats.timed_call('cache', lookup)
+        
+        def lookups():
+            for file_path in files:
+                if self.args.archives and _archive_kind(file_path.name):
+                    yield file_path, None  # Member results are not cached
+                    continue
+                result = lookup(file_path, mode, detailed)
+                if result is not None and rewriting and result.count:
+                    result = None
+                yield file_path, result
+        
+        for result in self._run_files(method_name, lookups(), *extra):
+            # A rewritten file has changed on disk; it is rescanned next time
+            if not result.cached and not result.modified and result.members is None:
+                # Findings cut off by --max-findings-per-file are not full details
+                self.cache.store(result, mode, detailed and len(result.findings) == result.count)
+            yield result
+    
+    def _run_files(self, method_name: str, items: Iterable[Tuple[Path, Optional[FileResult]]], *extra) -> Iterator[FileResult]:
+        """Run a per-file method over (file, cached result) pairs, in a process pool with --jobs > 1.
+        
+        Files that already have a result are passed through. Results are yielded
+        in input order regardless of the number of workers, so output stays
+        deterministic, and only a bounded number of batches is submitted ahead
+        of the one being reported, so files are consumed as they are found.
+        """
+        items = iter(items)
+        head = list(itertools.islice(items, 2))
+        jobs = self.args.jobs or os.cpu_count() or 1
+        if jobs <= 1 or len(head) < 2:
+            method = self._file_method(method_name)
+            for file_path, result in itertools.chain(head, items):
+                yield result if result is not None else method(file_path, *extra)
+            return
+        
+        from concurrent.futures import ProcessPoolExecutor
+        
+        # Hand out files in batches to amortize the IPC cost per file
+        batches = iter(lambda: list(itertools.islice(items, WORKER_BATCH_SIZE)), [])
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(self.args,)) as executor:
+            pending = deque()
+            for batch in itertools.chain([head], batches):
+                misses = [file_path for file_path, result in batch if result is None]
+                future = executor.submit(_run_worker_batch, method_name, misses, extra) if misses else None
+                pending.append((batch, future))
+                if len(pending) > jobs * 2:
+                    yield from self._merge_batch(*pending.popleft())
+            while pending:
+                yield from self._merge_batch(*pending.popleft())
+    
+    def _file_method(self, method_name: str) -> Callable[..., FileResult]:
+        """Return a per-file method by name, wrapped to attach FileStats to its results with --stats."""
+        method = getattr(self, method_name)
+        if not self.args.stats:
+            return method
+        
+        def timed(file_path: Path, *extra) -> FileResult:
+            try:
+                size = os.path.getsize(file_path)
+            except OSError:
+                size = 0
+            self._file_stats = stats = FileStats()
+            wall, cpu = time.perf_counter(), time.process_time()
+            try:
+                result = method(file_path, *extra)
+            finally:
+                self._file_stats = None
+            stats.wall = time.perf_counter() - wall
+            stats.cpu = time.process_time() - cpu
+            # Whatever was not timed as matching or writing went to reading the file
+            timed_wall = sum(times[0] for times in stats.phases.values())
+            timed_cpu = sum(times[1] for times in stats.phases.values())
+            stats.add('read', stats.wall - timed_wall, stats.cpu - timed_cpu)
+            
+            if not result.error:
+                stats.bytes_read = min(size, SNIFF_SIZE) if result.skipped else size
+            if result.modified:
+                with contextlib.suppress(OSError):
+                    stats.bytes_written = os.path.getsize(file_path)
+            result.stats = stats
+            return result
+        return timed
+    
+    @staticmethod
+    def _merge_batch(batch: List[Tuple[Path, Optional[FileResult]]], future) -> Iterator[FileResult]:
+        """Yield a batch's results in order, filling the gaps from the worker's results."""
+        fresh = iter(future.result() if future is not None else ())
+        for file_path, result in batch:
+            yield result if result is not None else next(fresh)
+    
+    def _dry_run_mode(self, files: Iterable[Path]) -> int:
         """Execute dry run mode - scan and report without modifications."""
         if not self.args.quiet:
             self.logger.info("DRY RUN MODE - No files will be modified")
         
-        for file_path in files:
-            self._scan_file_for_emojis(file_path)
+        for result in self._map_files('_scan_file_for_emojis', files):
+            self._record_emoji_scan(result)
         
         self._print_summary()
         return 0
     
-    def _remove_mode(self, files: List[Path]) -> int:
+    def _remove_mode(self, files: Iterable[Path]) -> int:
         """Execute remove mode - delete emojis from files."""
         if not self.args.force:
             if not self._confirm_action("Delete Emojis"):
@@ -232,201 +1858,847 @@ class NoMoEmo:
         
         files_modified = 0
         total_emojis_removed = 0
+        modified_dirs = set()
         
-        for file_path in files:
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    original_content = f.read()
+        for result in self._map_files('_rewrite_file', files, ''):
+            if result.error:
+                self.logger.warning(result.error)
+                continue
+            if result.skipped:
+                self.logger.debug(f"Skipped binary file {result.path}")
+                continue
+            
+            if result.modified:
+                files_modified += 1
+                total_emojis_removed += result.count
+                modified_dirs.add(os.path.dirname(os.path.realpath(result.path)))
                 
-                # Use emoji library to remove all emojis
-                modified_content = emoji.replace_emoji(original_content, replace='')
+                if self.args.verbose:
+                    self.logger.info(f"[-] Removed {result.count} emoji(s) from {result.path}")
+            
+            self.files_processed += 1
+        
+        self._sync_directories(modified_dirs)
+        if not self.args.quiet or total_emojis_removed > 0:
+            self.logger.info(f"[+] Removed {total_emojis_removed} emojis from {files_modified} files.")
+        return 0
+    
+    def _replace_mode(self, files: Iterable[Path]) -> int:
+        """Execute replace mode - replace emojis with specified character."""
+        if not self.args.force:
+            if not self._confirm_action(f"Replace Emojis with '{self.args.replacement}'"):
+                return 0
+        
+        # Process files for replacement
+        if not self.args.quiet:
+            self.logger.info(f"REPLACE MODE - Emojis will be replaced with '{self.args.replacement}'")
+        
+        files_modified = 0
+        total_emojis_replaced = 0
+        modified_dirs = set()
+        
+        for result in self._map_files('_rewrite_file', files, self.args.replacement):
+            if result.error:
+                self.logger.warning(result.error)
+                continue
+            if result.skipped:
+                self.logger.debug(f"Skipped binary file {result.path}")
+                continue
+            
+            if result.modified:
+                files_modified += 1
+                total_emojis_replaced += result.count
+                modified_dirs.add(os.path.dirname(os.path.realpath(result.path)))
                 
-                # Check if any emojis were actually removed
-                emojis_removed = len(emoji.emoji_list(original_content))
-                if emojis_removed > 0:
-                    # Write the modified content back to the file
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(modified_content)
-                    
-                    files_modified += 1
-                    total_emojis_removed += emojis_removed
-                    
-                    if self.args.verbose:
-                        self.logger.info(f"[-] Removed {emojis_removed} emoji(s) from {file_path}")
+                if self.args.verbose:
+                    self.logger.info(f"[-] Replaced {result.count} emoji(s) in {result.path}")
+            
+            self.files_processed += 1
+        
+        self._sync_directories(modified_dirs)
+        if not self.args.quiet or total_emojis_replaced > 0:
+            self.logger.info(f"[+] Replaced {total_emojis_replaced} emojis in {files_modified} files.")
+        return 0
+    
+    def _sync_directories(self, directories: Iterable[str]):
+        """With --fsync, flush the renames of rewritten files, once per directory.
+        
+        File data is synced before each rename (see _atomic_write); the
+        directory entries are synced here in one batch at the end of the run.
+        """
+        if not self.args.fsync:
+            return
+        for directory in sorted(directories):
+            try:
+                fd = os.open(directory, os.O_RDONLY)
+            except OSError as e:  # Directories cannot be opened on Windows
+                self.logger.debug(f"Could not sync directory {directory}: {e}")
+                continue
+            try:
+                os.fsync(fd)
+            except OSError as e:
+                self.logger.debug(f"Could not sync directory {directory}: {e}")
+            finally:
+                os.close(fd)
+    
+    def _ascii_only_mode(self, files: Iterable[Path]) -> int:
+        """Execute ASCII-only mode - scan for non-ASCII characters."""
+        if not self.args.quiet:
+            self.logger.info("ASCII-ONLY MODE - Scanning for non-ASCII characters (codepoints > 127)")
+        
+        for result in self._map_files('_scan_file_for_charset_violations', files, 'ascii'):
+            self._record_charset_scan(result, 'ascii')
+        
+        self._print_charset_summary('ascii')
+        return 0
+    
+    def _latin1_only_mode(self, files: Iterable[Path]) -> int:
+        """Execute Latin-1-only mode - scan for extended Unicode characters."""
+        if not self.args.quiet:
+            self.logger.info("LATIN1-ONLY MODE - Scanning for extended Unicode characters (codepoints > 255)")
+        
+        for result in self._map_files('_scan_file_for_charset_violations', files, 'latin1'):
+            self._record_charset_scan(result, 'latin1')
+        
+        self._print_charset_summary('latin1')
+        return 0
+    
+    def _watch(self, target_path: Path) -> int:
+        """Scan the target, then rescan the files whose size or mtime changes until interrupted (--watch).
+        
+        The first pass reports like a normal run. After that the tree is
+        swept every --watch-interval seconds, and once a change is seen,
+        sweeps repeat every --watch-debounce seconds until the tree is
+        unchanged, so a burst of saves costs one rescan. Only changed files
+        are rescanned, and only new and fixed findings are reported.
+        """
+        if self.args.dry_run:
+            charset = None
+            method, extra, record = '_scan_file_for_emojis', (), self._record_emoji_scan
+        else:
+            charset = 'ascii' if self.args.ascii_only else 'latin1'
+            method, extra = '_scan_file_for_charset_violations', (charset,)
+            record = functools.partial(self._record_charset_scan, charset=charset)
+        
+        findings = {}  # Path -> findings, see _watch_findings
+        counts = {}  # Path -> number of findings
+        try:
+            snapshot = self._watch_snapshot(target_path)
+            for result in self._map_files(method, list(snapshot), *extra):
+                record(result)
+                if not result.error:
+                    findings[result.path] = self._watch_findings(result, charset)
+                    counts[result.path] = result.count
+            if charset is None:
+                self._print_summary()
+            else:
+                self._print_charset_summary(charset)
+            self.logger.info(f"Watching {target_path} for changes (Ctrl+C to stop)...")
+            
+            while True:
+                time.sleep(self.args.watch_interval)
+                current = self._watch_snapshot(target_path)
+                if current == snapshot:
+                    continue
+                while True:
+                    time.sleep(self.args.watch_debounce)
+                    settled = self._watch_snapshot(target_path)
+                    if settled == current:
+                        break
+                    current = settled
                 
-                self.files_processed += 1
+                changed = [file_path for file_path, signature in current.items()
+                           if snapshot.get(file_path) != signature]
+                added = fixed = 0
+                for file_path in snapshot.keys() - current.keys():
+                    fixed += self._log_watch_changes(file_path, findings.pop(file_path, []), [])[1]
+                    counts.pop(file_path, None)
+                for result in self._map_files(method, changed, *extra):
+                    if result.error:
+                        self.logger.warning(result.error)
+                        continue
+                    new_findings = self._watch_findings(result, charset)
+                    file_added, file_fixed = self._log_watch_changes(result.path, findings.get(result.path, []),
+                                                                     new_findings)
+                    added += file_added
+                    fixed += file_fixed
+                    findings[result.path] = new_findings
+                    counts[result.path] = result.count
+                snapshot = current
                 
-            except UnicodeDecodeError as e:
-                self.logger.warning(f"Could not decode {file_path} as UTF-8: {e}")
-            except Exception as e:
-                self.logger.warning(f"Could not process {file_path}: {e}")
+                self.logger.info(f"[*] Rescanned {len(changed)} file(s): {added} new, {fixed} fixed; "
+                                 f"{sum(counts.values())} finding(s) in "
+                                 f"{sum(1 for count in counts.values() if count)} files.")
+        except KeyboardInterrupt:
+            self.logger.info("Stopped watching.")
+        return 0
+    
+    def _watch_snapshot(self, target_path: Path) -> Dict[Path, Tuple[int, int]]:
+        """Return the (size, mtime_ns) of every file to process, in traversal order."""
+        snapshot = {}
+        for file_path in self._get_files_to_process(target_path):
+            try:
+                file_stat = os.stat(file_path)
+            except OSError:
+                continue  # Removed since it was listed
+            snapshot[file_path] = (file_stat.st_size, file_stat.st_mtime_ns)
+        return snapshot
+    
+    @staticmethod
+    def _watch_findings(result: FileResult, charset: Optional[str]) -> List[Tuple[Tuple[str, int], int, int, str]]:
+        """Return a scan result's findings as (key, line, col, description) tuples in file order.
+        
+        The key is the finding's text and column, so a finding whose line
+        merely moved keeps its key (see _log_watch_changes).
+        """
+        if charset is None:
+            return [((found, col_num), line_num, col_num, context)
+                    for line_num, col_num, context, found in result.findings]
+        return [((char, col_num), line_num, col_num, f"U+{codepoint:04X} '{char}' - {context}")
+                for char, codepoint, line_num, col_num, context in result.findings]
+    
+    def _log_watch_changes(self, file_path: Path, old: List[Tuple[Tuple[str, int], int, int, str]],
+                           new: List[Tuple[Tuple[str, int], int, int, str]]) -> Tuple[int, int]:
+        """Log the findings of new that are not in old and vice versa; return (new, fixed) counts.
+        
+        The two finding sequences are aligned by key, so lines inserted or
+        removed above a finding do not report it as fixed and new again.
+        """
+        import difflib
+        
+        matcher = difflib.SequenceMatcher(None, [finding[0] for finding in old], [finding[0] for finding in new],
+                                          autojunk=False)
+        added = fixed = 0
+        for tag, old_start, old_end, new_start, new_end in matcher.get_opcodes():
+            if tag == 'equal':
+                continue
+            for _, line_num, col_num, description in old[old_start:old_end]:
+                self.logger.info(f"[+] Fixed in {file_path}, Line {line_num}, Col {col_num}: {description}")
+            for _, line_num, col_num, description in new[new_start:new_end]:
+                self.logger.info(f"[-] New in {file_path}, Line {line_num}, Col {col_num}: {description}")
+            fixed += old_end - old_start
+            added += new_end - new_start
+        return added, fixed
+    
+    def _run_stdin(self) -> int:
+        """Process standard input as it arrives (target '-' or --stdin).
+        
+        --remove and --replace write the input to stdout with the emojis
+        removed or replaced, and need no confirmation since no file changes.
+        The scan modes report findings as for a file named <stdin>. Input is
+        read in STREAM_CHUNK_SIZE pieces, so memory stays bounded; binary
+        input is passed through (or skipped) as a binary file would be, and
+        input in another encoding than UTF-8 is decoded (and, rewritten,
+        encoded back) as a file in it would be.
+        """
+        chunks = iter(functools.partial(sys.stdin.buffer.read1, STREAM_CHUNK_SIZE), b'')
+        head = b''
+        for chunk in chunks:
+            head += chunk
+            if len(head) >= SNIFF_SIZE:
+                break
+        encoding = _classify_text(head[:SNIFF_SIZE], len(head) < SNIFF_SIZE)
+        chunks = itertools.chain([head], chunks)
+        
+        if self.args.remove or self.args.replace:
+            return self._filter_stdin(chunks, encoding, self.args.replacement or '')
+        
+        if not self._open_reporter():
+            return 1
+        try:
+            result = FileResult(Path(STDIN_NAME))
+            if self.args.dry_run:
+                process = self._emoji_processor(result)
+            else:
+                charset = 'ascii' if self.args.ascii_only else 'latin1'
+                process = self._charset_processor(result, charset)
+            if encoding is not None:
+                try:
+                    self._scan_chunks(chunks, process, encoding=encoding)
+                except UnicodeDecodeError as e:
+                    result.error = f"Could not decode {STDIN_NAME}: {e}"
+            else:
+                result.skipped = True
+            
+            if self.args.dry_run:
+                self._record_emoji_scan(result)
+                self._print_summary()
+            else:
+                self._record_charset_scan(result, charset)
+                self._print_charset_summary(charset)
+            return 1 if result.error else 0
+        finally:
+            self._close_reporter()
+    
+    def _filter_stdin(self, chunks: Iterator[bytes], encoding: Optional[str], replacement: str) -> int:
+        """Copy stdin chunks to stdout, removing or replacing the emojis in text input.
+        
+        Bytes after the last safe split point (see _stream_split) are carried
+        into the next chunk, so sequences cut by a read are matched whole.
+        Input in another encoding goes through _filter_decoded. Binary input,
+        and everything from a chunk that does not decode on, is copied
+        unchanged.
+        """
+        out = sys.stdout.buffer
+        if encoding is None:
+            self.logger.debug(f"Passing binary {STDIN_NAME} through unchanged")
+            out.writelines(chunks)
+            out.flush()
+            return 0
+        
+        count = 0
+        pending = b''
+        try:
+            if encoding == 'utf-8':
+                replacement = replacement.encode('utf-8')
+                for chunk in chunks:
+                    pending = pending + chunk if pending else chunk
+                    split = _stream_split(pending)
+                    count += self._write_rewritten(out, pending[:split], replacement)
+                    pending = pending[split:]
+                count += self._write_rewritten(out, pending, replacement)
+            else:
+                count = self._filter_decoded(out, chunks, encoding, replacement)
+        except UnicodeDecodeError as e:
+            self.logger.error(f"Could not decode {STDIN_NAME}, passing the rest through unchanged: {e}")
+            out.write(pending)
+            out.writelines(chunks)
+            out.flush()
+            return 1
+        out.flush()
+        
+        if not self.args.quiet or count > 0:
+            verb = 'Replaced' if replacement else 'Removed'
+            self.logger.info(f"[+] {verb} {count} emojis from {STDIN_NAME}.")
+        return 0
+    
+    def _filter_decoded(self, out, chunks: Iterator[bytes], encoding: str, replacement: str) -> int:
+        """Rewrite stdin chunks in a codec other than UTF-8 as text; return the emoji count.
+        
+        The text is written back through an incremental encoder with the
+        input's own byte order mark (see _output_codec). Text after the last
+        newline is carried into the next chunk, up to STDIN_MAX_CARRY
+        characters. If a chunk does not decode, the text and bytes not yet
+        written are copied unchanged before the UnicodeDecodeError is
+        raised on to _filter_stdin.
+        """
+        first = next(chunks, b'')
+        bom, codec = _output_codec(encoding, first)
+        decoder = codecs.getincrementaldecoder(encoding)()
+        encoder = codecs.getincrementalencoder(codec)()
+        out.write(bom)
+        count = 0
+        pending = ''
+        # The empty chunk at the end flushes the decoder; reads never return one
+        for chunk in itertools.chain([first], chunks, [b'']):
+            carried = decoder.getstate()[0]
+            try:
+                pending += decoder.decode(chunk, not chunk)
+            except UnicodeDecodeError:
+                out.write(encoder.encode(pending) + carried + (chunk[len(bom):] if chunk is first else chunk))
+                raise
+            split = pending.rfind('\n') + 1 if chunk else len(pending)
+            if not split and len(pending) > STDIN_MAX_CARRY:
+                split = len(pending)
+            if split:
+                spans = self._find_emoji_spans(pending[:split])
+                out.write(encoder.encode(_splice_text(pending[:split], spans, replacement)))
+                count += len(spans)
+                pending = pending[split:]
+        return count
+    
+    def _write_rewritten(self, out, data: bytes, replacement: bytes) -> int:
+        """Write UTF-8 data with every emoji replaced; return how many there were."""
+        spans = self._find_emoji_byte_spans(data)
+        if spans:
+            out.writelines(self._splice_spans(data, spans, replacement))
+        else:
+            out.write(data)
+        return len(spans)
+    
+    def _find_emoji_spans(self, content: str) -> List[Tuple[int, int]]:
+        """Return the (start, end) offsets of every emoji in content, in order."""
+        return self.emoji_matcher.find_spans(content)
+    
+    def _find_emoji_byte_spans(self, data: bytes) -> List[Tuple[int, int]]:
+        """Return the (start, end) byte offsets of every emoji in UTF-8 data, in order.
+        
+        Pure-ASCII data is settled by one bytes.isascii() check; otherwise
+        only the regions around non-ASCII bytes are decoded and matched. The
+        regions start and end on ASCII bytes, so no emoji straddles two.
+        """
+        if data.isascii():
+            return []
+        byte_spans = []
+        for start, end in _non_ascii_regions(data, SCAN_BLOCK_SIZE):
+            # No newline translation: emoji never contain CR, and offsets must match the bytes
+            text = data[start:end].decode('utf-8')
+            byte_spans.extend((start + span_start, start + span_end)
+                              for span_start, span_end in _byte_spans(text, self._find_emoji_spans(text)))
+        return byte_spans
+    
+    @staticmethod
+    def _splice_spans(data: bytes, spans: List[Tuple[int, int]], replacement: bytes) -> List[bytes]:
+        """Return the pieces of data with every byte span replaced by replacement."""
+        view = memoryview(data)
+        pieces = []
+        pos = 0
+        for start, end in spans:
+            pieces.append(view[pos:start])
+            pieces.append(replacement)
+            pos = end
+        pieces.append(view[pos:])
+        return pieces
+    
+    def _rewrite_file(self, file_path: Path, replacement: str) -> FileResult:
+        """Replace (or remove, if replacement is empty) all emojis in a single file.
+        
+        A single matcher pass yields the spans and the count. In UTF-8 files
+        only the matched byte ranges are spliced out of the original bytes, so
+        line endings, a BOM and everything else are left exactly as they
+        were; files in another encoding (see _classify_text) are rewritten as
+        decoded text and encoded back in it, with their byte order mark. The
+        result is written atomically (see _atomic_write). Files without
+        emojis are never rewritten.
+        """
+        result = FileResult(file_path)
+        try:
+            self._rewrite(result, replacement)
+        except UnicodeDecodeError as e:
+            result.error = f"Could not decode {file_path}: {e}"
+        except Exception as e:
+            result.error = f"Could not process {file_path}: {e}"
+        return result
+    
+    def _rewrite(self, result: FileResult, replacement: str):
+        """Body of _rewrite_file, filling in result and raising on failure."""
+        with open(result.path, 'rb') as f:
+            raw, encoding = _read_text(f, os.fstat(f.fileno()).st_size)
+        if raw is None:
+            result.skipped = True
+            return
+        
+        if encoding == 'utf-8':
+            data, find_spans = raw, self._find_emoji_byte_spans
+        else:
+            # No newline translation, so line endings are written back as they were
+            data, find_spans = raw.decode(encoding), self._find_emoji_spans
+        write = _atomic_write
+        if self._file_stats is not None:
+            find_spans = self._file_stats.timed('match', find_spans)
+            write = self._file_stats.timed('write', write)
+        
+        spans = find_spans(data)
+        result.count = len(spans)
+        if spans:
+            if encoding == 'utf-8':
+                pieces = self._splice_spans(data, spans, replacement.encode('utf-8'))
+            else:
+                bom, codec = _output_codec(encoding, raw)
+                pieces = [bom, _splice_text(data, spans, replacement).encode(codec)]
+            write(result.path, pieces, self.args.fsync)
+            result.modified = True
+    
+    def _scan_chunks(self, chunks: Iterator[bytes], process: Callable[[str, int, bool, LineIndex], int],
+                     base_line: int = 1, base_col: int = 0, encoding: str = 'utf-8'):
+        """Decode byte chunks incrementally (UTF-8 unless given) and feed them through a window processor.
+        
+        Whatever the processor has not finished with is carried into the next
+        window, along with a little already-scanned text for report context,
+        so memory stays bounded by the chunk size.
+        """
+        # Same newline translation as text mode, so offsets match the in-memory path
+        decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder(encoding)(), translate=True)
+        text = ''
+        start = 0
+        for chunk in chunks:
+            text += decoder.decode(chunk)
+            line_index = LineIndex(text, base_line, base_col)
+            done = process(text, start, False, line_index)
+            
+            keep = max(0, done - CONTEXT_CHARS)
+            base_line, base_col = line_index.state_at(keep)
+            text = text[keep:]
+            start = done - keep
         
-        if not self.args.quiet or total_emojis_removed > 0:
-            self.logger.info(f"[+] Removed {total_emojis_removed} emojis from {files_modified} files.")
-        return 0
+        text += decoder.decode(b'', True)
+        process(text, start, True, LineIndex(text, base_line, base_col))
     
-    def _replace_mode(self, files: List[Path]) -> int:
-        """Execute replace mode - replace emojis with specified character."""
-        if not self.args.force:
-            if not self._confirm_action(f"Replace Emojis with '{self.args.replacement}'"):
-                return 0
+    def _scan_regions(self, buffer, process: Callable[[str, int, bool, LineIndex], int],
+                      block_size: int = MMAP_BLOCK_SIZE) -> bool:
+        """Scan raw UTF-8 bytes, decoding only the regions around non-ASCII bytes.
         
-        # Process files for replacement
-        if not self.args.quiet:
-            self.logger.info(f"REPLACE MODE - Emojis will be replaced with '{self.args.replacement}'")
+        Non-ASCII blocks are found on the bytes themselves, and only the
+        regions around them are decoded (in chunks), positioned by their line
+        and column; pure-ASCII stretches can hold neither emoji nor charset
+        violations. The line and column are carried from the end of one
+        region to the start of the next, so every byte is looked at a fixed
+        number of times even on files that are one long line. Returns False,
+        having scanned nothing, for buffers with lone CR line breaks, whose
+        line numbers only the decoding path gets right.
+        """
+        if _LONE_CR_BYTES_REGEX.search(buffer):
+            return False
         
-        files_modified = 0
-        total_emojis_replaced = 0
+        line_num = 1
+        col = 0  # Column at offset counted
+        counted = 0
+        for start, end in _non_ascii_regions(buffer, block_size):
+            # The bytes between regions are ASCII: one column each after the last newline
+            line_num += _count_newlines(buffer, counted, start)
+            newline = buffer.rfind(b'\n', counted, start)
+            base_col = start - newline - 1 if newline >= 0 else col + start - counted
+            
+            chunks = (buffer[i:min(end, i + STREAM_CHUNK_SIZE)] for i in range(start, end, STREAM_CHUNK_SIZE))
+            self._scan_chunks(chunks, process, line_num, base_col)
+            
+            line_num += _count_newlines(buffer, start, end)
+            newline = buffer.rfind(b'\n', start, end)
+            if newline >= 0:
+                col = _count_chars(buffer, newline + 1, end)
+            else:
+                col = base_col + _count_chars(buffer, start, end)
+            counted = end
+        return True
+    
+    def _scan_mapped(self, f, process: Callable[[str, int, bool, LineIndex], int]) -> bool:
+        """Scan a memory-mapped file with _scan_regions, without reading it into memory."""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return self._scan_regions(mapped, process)
+    
+    def _scan_text(self, file_path: Path, process: Callable[[str, int, bool, LineIndex], int]) -> bool:
+        """Feed a file's decoded text through a window processor.
+        
+        ``process(text, start, final, line_index)`` scans ``text[start:]`` and
+        returns the offset up to which it is done. The file is opened once and
+        classified from its first bytes (see _classify_text); returns False,
+        having scanned nothing, for binary files. Small files are read whole:
+        pure-ASCII UTF-8 ones are done without decoding anything, and
+        otherwise only the regions around non-ASCII bytes are decoded (see
+        _scan_regions). UTF-8 files over MMAP_THRESHOLD are memory-mapped
+        (see _scan_mapped), and otherwise files over --stream-threshold are
+        read and decoded in STREAM_CHUNK_SIZE chunks.
+        """
+        if self._file_stats is not None:
+            process = self._file_stats.timed('match', process)
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < MMAP_THRESHOLD and size < self.args.stream_threshold:
+                data, encoding = _read_text(f, size)
+                if data is None:
+                    return False
+            else:
+                encoding = _classify_text(f.read(SNIFF_SIZE), size <= SNIFF_SIZE)
+                if encoding is None:
+                    return False
+                if (encoding == 'utf-8' and size >= MMAP_THRESHOLD and not self.args.no_mmap
+                        and self._scan_mapped(f, process)):
+                    return True
+                f.seek(0)
+                if size >= self.args.stream_threshold:
+                    self._scan_chunks(iter(lambda: f.read(STREAM_CHUNK_SIZE), b''), process, encoding=encoding)
+                    return True
+                data = f.read()
+        self._scan_data(data, process, encoding)
+        return True
+    
+    def _scan_data(self, data: bytes, process: Callable[[str, int, bool, LineIndex], int],
+                   encoding: str = 'utf-8'):
+        """Feed bytes held in memory (UTF-8 unless given) through a window processor (see _scan_text)."""
+        if encoding != 'utf-8':
+            content = _decode_text(data, encoding)
+        elif data.isascii() or self._scan_regions(data, process, SCAN_BLOCK_SIZE):
+            return
+        else:
+            content = _decode_text(data)
+        process(content, 0, True, LineIndex(content))
+    
+    def _scan_archive(self, result: FileResult, make_processor: Callable[[FileResult], Callable[[str, int, bool, LineIndex], int]]):
+        """Scan the members of a zip or tar archive in memory, one FileResult each in result.members.
         
-        for file_path in files:
+        Members are named ``archive!member``. They are selected by the same
+        suffix and excluded directory rules as files, read whole (up to
+        --archive-max-member-size) and sniffed and scanned like files, with a
+        window processor from make_processor(member). Nested archives are not
+        opened. After --archive-max-members members the scan stops, noted in
+        result.error.
+        """
+        excluded = set() if self.args.no_default_excludes else set(DEFAULT_EXCLUDE_DIRS)
+        excluded.update(self.args.exclude_dir or ())
+        max_size = self.args.archive_max_member_size
+        result.members = members = []
+        for name, size, open_member in self._archive_members(result.path):
+            inner = Path(name)
+            if (excluded.intersection(inner.parts[:-1]) or _archive_kind(name)
+                    or not self._should_process_file(inner)):
+                continue
+            if len(members) >= self.args.archive_max_members:
+                result.error = (f"Stopped scanning {result.path} after {len(members)} members "
+                                f"(--archive-max-members)")
+                break
+            
+            member = FileResult(Path(f"{result.path}!{name}"))
+            members.append(member)
+            if size > max_size:
+                member.error = f"Skipped {member.path}: larger than --archive-max-member-size ({size} bytes)"
+                continue
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    original_content = f.read()
-                
-                # Use emoji library to replace all emojis with the specified character
-                modified_content = emoji.replace_emoji(original_content, replace=self.args.replacement)
-                
-                # Check if any emojis were actually replaced
-                emojis_replaced = len(emoji.emoji_list(original_content))
-                if emojis_replaced > 0:
-                    # Write the modified content back to the file
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(modified_content)
-                    
-                    files_modified += 1
-                    total_emojis_replaced += emojis_replaced
-                    
-                    if self.args.verbose:
-                        self.logger.info(f"[-] Replaced {emojis_replaced} emoji(s) in {file_path}")
-                
-                self.files_processed += 1
-                
+                with open_member() as f:
+                    data = f.read(max_size + 1)
+                if len(data) > max_size:
+                    member.error = f"Skipped {member.path}: larger than --archive-max-member-size"
+                    continue
+                encoding = _classify_text(data[:SNIFF_SIZE], len(data) <= SNIFF_SIZE)
+                if encoding is None:
+                    member.skipped = True
+                else:
+                    self._scan_data(data, make_processor(member), encoding)
             except UnicodeDecodeError as e:
-                self.logger.warning(f"Could not decode {file_path} as UTF-8: {e}")
+                member.error = f"Could not decode {member.path}: {e}"
             except Exception as e:
-                self.logger.warning(f"Could not process {file_path}: {e}")
-        
-        if not self.args.quiet or total_emojis_replaced > 0:
-            self.logger.info(f"[+] Replaced {total_emojis_replaced} emojis in {files_modified} files.")
-        return 0
+                member.error = f"Could not process {member.path}: {e}"  # e.g. an encrypted zip member
     
-    def _ascii_only_mode(self, files: List[Path]) -> int:
-        """Execute ASCII-only mode - scan for non-ASCII characters."""
-        if not self.args.quiet:
-            self.logger.info("ASCII-ONLY MODE - Scanning for non-ASCII characters (codepoints > 127)")
+    @staticmethod
+    def _archive_members(file_path: Path) -> Iterator[Tuple[str, int, Callable]]:
+        """Yield (name, size, open function) for the regular files in an archive, in archive order.
         
-        for file_path in files:
-            self._scan_file_for_charset_violations(file_path, 'ascii')
-        
-        self._print_charset_summary('ascii')
-        return 0
+        Tar archives are read as a stream (any compression), so each member
+        must be opened before the next one is yielded.
+        """
+        if _archive_kind(file_path.name) == 'zip':
+            import zipfile
+            with zipfile.ZipFile(file_path) as archive:
+                for info in archive.infolist():
+                    if not info.is_dir():
+                        yield info.filename, info.file_size, functools.partial(archive.open, info)
+            return
+        import tarfile
+        with tarfile.open(file_path, 'r|*') as archive:
+            for info in archive:
+                if info.isfile():
+                    yield info.name, info.size, functools.partial(archive.extractfile, info)
     
-    def _latin1_only_mode(self, files: List[Path]) -> int:
-        """Execute Latin-1-only mode - scan for extended Unicode characters."""
-        if not self.args.quiet:
-            self.logger.info("LATIN1-ONLY MODE - Scanning for extended Unicode characters (codepoints > 255)")
-        
-        for file_path in files:
-            self._scan_file_for_charset_violations(file_path, 'latin1')
-        
-        self._print_charset_summary('latin1')
-        return 0
+    @staticmethod
+    def _scan_string(text: str, process: Callable[[str, int, bool, LineIndex], int]):
+        """Feed an in-memory text through a window processor, with text-mode newline translation."""
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        process(text, 0, True, LineIndex(text))
     
-    def _scan_file_for_emojis(self, file_path: Path):
-        """Scan a single file for emojis and catalog findings."""
+    def _scan_file_for_emojis(self, file_path: Path) -> FileResult:
+        """Scan a single file (or archive, with --archives) for emojis and catalog findings (see _emoji_processor)."""
+        result = FileResult(file_path)
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Use emoji library to find all emojis in the file
-            emoji_matches = emoji.emoji_list(content)
-            
-            if emoji_matches:
-                self.files_with_emojis += 1
-                self.emoji_count += len(emoji_matches)
-                
-                # For dry-run mode, report findings
-                if self.args.dry_run:
-                    self.logger.info(f"[-] Found {len(emoji_matches)} emoji(s) in {file_path}")
-                    
-                    # Show details if verbose
-                    if self.args.verbose:
-                        for match in emoji_matches:
-                            # Calculate line and column numbers
-                            line_num = content[:match['match_start']].count('\n') + 1
-                            line_start = content.rfind('\n', 0, match['match_start']) + 1
-                            col_num = match['match_start'] - line_start + 1
-                            
-                            # Get context around the emoji (avoid printing emoji chars)
-                            context_start = max(0, match['match_start'] - 20)
-                            context_end = min(len(content), match['match_end'] + 20)
-                            context = content[context_start:context_end]
-                            # Replace newlines and the emoji itself for clean display
-                            context = context.replace('\n', ' ').replace(content[match['match_start']:match['match_end']], '[EMOJI]')
-                            
-                            self.logger.info(f"  Line {line_num}, Col {col_num}: {context}")
-            
-            self.files_processed += 1
+            if self.args.archives and _archive_kind(file_path.name):
+                self._scan_archive(result, self._emoji_processor)
+            else:
+                result.skipped = not self._scan_text(file_path, self._emoji_processor(result))
             
         except UnicodeDecodeError as e:
-            self.logger.warning(f"Could not decode {file_path} as UTF-8: {e}")
+            result.error = f"Could not decode {file_path}: {e}"
         except Exception as e:
-            self.logger.warning(f"Could not process {file_path}: {e}")
+            result.error = f"Could not process {file_path}: {e}"
+        return result
     
-    def _scan_file_for_charset_violations(self, file_path: Path, charset: str):
-        """Scan a single file for character set violations and catalog findings."""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Determine the codepoint limit based on charset
-            if charset == 'ascii':
-                max_codepoint = 127
-                violation_desc = "non-ASCII"
-            elif charset == 'latin1':
-                max_codepoint = 255
-                violation_desc = "extended Unicode"
-            else:
-                raise ValueError(f"Unknown charset: {charset}")
+    def _emoji_processor(self, result: FileResult) -> Callable[[str, int, bool, LineIndex], int]:
+        """Return a window processor that counts emojis into result.
+        
+        Findings are (line, col, context, emoji) tuples, only collected in
+        verbose mode or with --format (up to --max-findings-per-file).
+        """
+        def process(text: str, start: int, final: bool, line_index: LineIndex) -> int:
+            spans = self.emoji_matcher.find_spans(text, start)
+            done = len(text)
+            if not final:
+                # Spans reaching into the overlap may continue in the next chunk
+                done = max(start, done - STREAM_OVERLAP)
+                while spans and spans[-1][1] > done:
+                    done = min(done, spans.pop()[0])
             
-            violations_found = []
+            result.count += len(spans)
             
-            # Scan each character for violations
-            for i, char in enumerate(content):
-                codepoint = ord(char)
-                if codepoint > max_codepoint:
-                    # Calculate line and column numbers
-                    line_num = content[:i].count('\n') + 1
-                    line_start = content.rfind('\n', 0, i) + 1
-                    col_num = i - line_start + 1
+            # Collect details if verbose or reporting, up to --max-findings-per-file
+            if spans and self.detailed:
+                if self.max_findings is not None:
+                    spans = spans[:max(0, self.max_findings - len(result.findings))]
+                for span_start, span_end in spans:
+                    line_num, col_num = line_index.locate(span_start)
+                    
+                    # Get context around the emoji (avoid printing emoji chars)
+                    context_start = max(0, span_start - CONTEXT_CHARS)
+                    context_end = min(len(text), span_end + CONTEXT_CHARS)
+                    context = text[context_start:context_end]
+                    # Replace newlines and the emoji itself for clean display
+                    found = text[span_start:span_end]
+                    context = context.replace('\n', ' ').replace(found, '[EMOJI]')
                     
-                    violations_found.append((i, char, codepoint, line_num, col_num))
-                    self.charset_violations.append((file_path, char, codepoint, line_num, col_num))
+                    result.findings.append((line_num, col_num, context, found))
+            return done
+        return process
+    
+    def _record_archive(self, result: FileResult, record: Callable[[FileResult], None]):
+        """Record every member of a scanned archive, then note if the scan was cut short."""
+        for member in result.members:
+            record(member)
+        if result.error:
+            self.logger.warning(result.error)
+    
+    def _record_emoji_scan(self, result: FileResult):
+        """Merge a single file's emoji scan result into the totals and report it."""
+        if result.members is not None:
+            self._record_archive(result, self._record_emoji_scan)
+            return
+        if result.error:
+            self.logger.warning(result.error)
+            return
+        if result.skipped:
+            self.logger.debug(f"Skipped binary file {result.path}")
+            return
+        
+        if result.count:
+            self.files_with_emojis += 1
+            self.emoji_count += result.count
             
-            if violations_found:
-                self.files_with_charset_violations += 1
-                
-                # Report findings
-                self.logger.info(f"[-] Found {len(violations_found)} {violation_desc} character(s) in {file_path}")
+            # For dry-run mode, report findings
+            if self.reporter is not None:
+                path = str(result.path)
+                for line_num, col_num, context, _ in result.findings:
+                    self.reporter.write({'path': path, 'line': line_num, 'column': col_num,
+                                         'rule': 'emoji', 'context': context})
+                if len(result.findings) < result.count:
+                    self.reporter.truncated(result.path, result.count, len(result.findings))
+            elif self.args.dry_run:
+                self.logger.info(f"[-] Found {result.count} emoji(s) in {result.path}")
                 
                 # Show details if verbose
                 if self.args.verbose:
-                    for i, char, codepoint, line_num, col_num in violations_found:
-                        # Get context around the character
-                        context_start = max(0, i - 20)
-                        context_end = min(len(content), i + 21)  # +1 for the character itself
-                        context = content[context_start:context_end]
-                        # Replace newlines and the violating character for clean display
-                        context = context.replace('\n', ' ').replace(char, f'[U+{codepoint:04X}]')
-                        
-                        self.logger.info(f"  Line {line_num}, Col {col_num}: U+{codepoint:04X} '{char}' - {context}")
-            
-            self.files_processed += 1
+                    for line_num, col_num, context, _ in result.findings:
+                        self.logger.info(f"  Line {line_num}, Col {col_num}: {context}")
+                    self._log_truncated(result)
+        
+        self.files_processed += 1
+    
+    def _scan_file_for_charset_violations(self, file_path: Path, charset: str) -> FileResult:
+        """Scan a single file (or archive, with --archives) for character set violations (see _charset_processor)."""
+        result = FileResult(file_path)
+        try:
+            if self.args.archives and _archive_kind(file_path.name):
+                self._scan_archive(result, functools.partial(self._charset_processor, charset=charset))
+            else:
+                result.skipped = not self._scan_text(file_path, self._charset_processor(result, charset))
             
         except UnicodeDecodeError as e:
-            self.logger.warning(f"Could not decode {file_path} as UTF-8: {e}")
+            result.error = f"Could not decode {file_path}: {e}"
         except Exception as e:
-            self.logger.warning(f"Could not process {file_path}: {e}")
+            result.error = f"Could not process {file_path}: {e}"
+        return result
+    
+    def _charset_processor(self, result: FileResult, charset: str) -> Callable[[str, int, bool, LineIndex], int]:
+        """Return a window processor that counts charset violations into result.
+        
+        Findings go to a CharsetFindings store on result. Per-violation
+        details are only collected in verbose mode or with --format (up to
+        --max-findings-per-file); otherwise only the histogram is kept.
+        """
+        violation_regex = _CHARSET_VIOLATION_REGEX.get(charset)
+        if violation_regex is None:
+            raise ValueError(f"Unknown charset: {charset}")
+        findings = result.findings = CharsetFindings()
+        histogram = findings.histogram
+        
+        def process(text: str, start: int, final: bool, line_index: LineIndex) -> int:
+            # Whole-window check first: pure ASCII text can't violate either charset
+            if text.isascii():
+                return len(text)
+            
+            # Leave room for the trailing context of findings near the window end
+            done = len(text) if final else max(start, len(text) - CONTEXT_CHARS - 1)
+            if not self.detailed:
+                # Only the counts are reported
+                chars = violation_regex.findall(text, start, done)
+                result.count += len(chars)
+                histogram.update(chars)
+                return done
+            for match in violation_regex.finditer(text, start, done):
+                char = match.group()
+                result.count += 1
+                histogram[char] += 1
+                if self.max_findings is not None and len(findings) >= self.max_findings:
+                    continue
+                i = match.start()
+                codepoint = ord(char)
+                
+                line_num, col_num = line_index.locate(i)
+                
+                # Get context around the character
+                context_start = max(0, i - CONTEXT_CHARS)
+                context_end = min(len(text), i + CONTEXT_CHARS + 1)  # +1 for the character itself
+                context = text[context_start:context_end]
+                # Replace newlines and the violating character for clean display
+                context = context.replace('\n', ' ').replace(char, f'[U+{codepoint:04X}]')
+                
+                findings.append(codepoint, line_num, col_num, context)
+            return done
+        return process
+    
+    def _record_charset_scan(self, result: FileResult, charset: str):
+        """Merge a single file's charset scan result into the totals and report it."""
+        if result.members is not None:
+            self._record_archive(result, functools.partial(self._record_charset_scan, charset=charset))
+            return
+        if result.error:
+            self.logger.warning(result.error)
+            return
+        if result.skipped:
+            self.logger.debug(f"Skipped binary file {result.path}")
+            return
+        
+        violation_desc = "non-ASCII" if charset == 'ascii' else "extended Unicode"
+        
+        if result.count:
+            self.files_with_charset_violations += 1
+            self.charset_violation_count += result.count
+            self.charset_violations_by_file[result.path] = result.count
+            self.charset_histogram.update(result.findings.histogram)
+            
+            if self.reporter is not None:
+                path = str(result.path)
+                rule = 'non-ascii' if charset == 'ascii' else 'non-latin1'
+                for char, codepoint, line_num, col_num, context in result.findings:
+                    self.reporter.write({'path': path, 'line': line_num, 'column': col_num, 'rule': rule,
+                                         'codepoint': f'U+{codepoint:04X}', 'context': context})
+                if len(result.findings) < result.count:
+                    self.reporter.truncated(result.path, result.count, len(result.findings))
+                self.files_processed += 1
+                return
+            
+            # Report findings
+            self.logger.info(f"[-] Found {result.count} {violation_desc} character(s) in {result.path}")
+            
+            # Show details if verbose
+            if self.args.verbose:
+                for char, codepoint, line_num, col_num, context in result.findings:
+                    self.logger.info(f"  Line {line_num}, Col {col_num}: U+{codepoint:04X} '{char}' - {context}")
+                self._log_truncated(result)
+        
+        self.files_processed += 1
+    
+    def _print_stats(self):
+        """Write the --stats summary to stderr, as a table or as JSON."""
+        summary = self.stats.summary()
+        if self.args.stats == 'json':
+            text = json.dumps(summary, indent=2)
+        else:
+            text = RunStats.format_table(summary)
+        sys.stderr.write(text + '\n')
+        if self.args.log:
+            self.logger.debug(f"Run statistics:\n{text}")
+    
+    def _log_truncated(self, result: FileResult):
+        """Note findings left out of verbose output by --max-findings-per-file."""
+        omitted = result.count - len(result.findings)
+        if omitted > 0:
+            self.logger.info(f"  ... {omitted} more not shown (--max-findings-per-file)")
     
     def _confirm_action(self, action: str) -> bool:
         """Prompt user for confirmation of destructive actions."""
@@ -463,17 +2735,25 @@ class NoMoEmo:
             raise ValueError(f"Unknown charset: {charset}")
         
         if not self.args.quiet:
-            self.logger.info(f"[+] Total: {len(self.charset_violations)} {violation_desc} in {self.files_with_charset_violations} files.")
+            self.logger.info(f"[+] Total: {self.charset_violation_count} {violation_desc} in {self.files_with_charset_violations} files.")
             self.logger.info(f"[*] Processed {self.files_processed} files.")
             
+            if self.args.verbose and self.charset_histogram:
+                common = ', '.join(f"U+{ord(char):04X} x{count}"
+                                   for char, count in self.charset_histogram.most_common(CHARSET_HISTOGRAM_TOP))
+                self.logger.info(f"[*] Most frequent: {common}")
+                worst = sorted(self.charset_violations_by_file.items(), key=lambda item: -item[1])
+                self.logger.info("[*] Most affected: " + ', '.join(
+                    f"{path} ({count})" for path, count in worst[:CHARSET_HISTOGRAM_TOP]))
+            
             # Show character set compliance status
             if self.files_with_charset_violations == 0:
                 self.logger.info(f"[✓] All files are {limit_desc} compliant.")
             else:
                 self.logger.warning(f"[!] {self.files_with_charset_violations} files contain {violation_desc}.")
-        elif len(self.charset_violations) > 0:
+        elif self.charset_violation_count > 0:
             # In quiet mode, only show summary if violations were found (use warning level to show)
-            self.logger.warning(f"[+] Total: {len(self.charset_violations)} {violation_desc} in {self.files_with_charset_violations} files.")
+            self.logger.warning(f"[+] Total: {self.charset_violation_count} {violation_desc} in {self.files_with_charset_violations} files.")
 
 
 def create_argument_parser() -> argparse.ArgumentParser:
@@ -504,12 +2784,19 @@ EXAMPLES:
 
   CI/CD and automation:
     nomoemo.py --dry-run --quiet --recursive ./    # Silent scan for CI
+    nomoemo.py --cache .nomoemo-cache --recursive ./  # Skip unchanged files
+    nomoemo.py --staged --recursive ./             # Pre-commit: staged files only
+    nomoemo.py --changed-since origin/main --recursive ./  # Files changed on a branch
+    nomoemo.py --dry-run --jobs 0 --recursive ./   # Scan using all CPU cores
+    nomoemo.py --exclude-dir build --recursive ./  # Also skip build/ directories
     nomoemo.py --remove --force --quiet ./src/     # Silent removal for automation
 
   Logging and output:
     nomoemo.py --dry-run --log scan.log ./src/     # Log to file
     nomoemo.py --dry-run --verbose ./src/          # Detailed console output
     nomoemo.py --dry-run --quiet ./src/            # Minimal output
+    nomoemo.py --ascii-only --format jsonl --recursive ./  # One JSON record per finding
+    nomoemo.py --format sarif -o emoji.sarif --recursive ./  # SARIF log for code scanning
 
 EXIT CODES:
   0  Success - no errors, emojis processed as requested
@@ -520,15 +2807,26 @@ NOTES:
   - Default mode is --dry-run if no action is specified
   - Use --force to skip confirmation prompts for destructive operations
   - Binary files are automatically detected and skipped
-  - Only UTF-8 encoded text files are processed
-  - Hidden files and directories (starting with .) are processed
+  - UTF-8, UTF-16/UTF-32 (with a BOM, or BOM-less UTF-16) and Latin-1 text
+    files are detected and processed; rewrites keep the file's encoding
+  - Hidden files and directories (starting with .) are processed, except
+    VCS metadata and tool caches (.git, node_modules, .venv, ...); see
+    --no-default-excludes
+  - Files matched by .gitignore or .nomoemoignore are skipped; see --no-ignore
         """
     )
     
     # Positional argument
     parser.add_argument(
         'target',
-        help='File or directory to process'
+        nargs='?',
+        help="File or directory to process, or '-' for standard input (not used with --serve)"
+    )
+    parser.add_argument(
+        '--stdin',
+        action='store_true',
+        help='Read standard input instead of a target: --remove and --replace write the result to stdout, '
+             'the scan modes report findings for <stdin>'
     )
     
     # Mode selection (mutually exclusive)
@@ -576,6 +2874,191 @@ NOTES:
         help='Skip confirmation prompts for destructive operations (--remove, --replace)'
     )
     
+    parser.add_argument(
+        '--exclude-dir',
+        action='append',
+        metavar='NAME',
+        help='Skip directories with this name during traversal (repeatable)'
+    )
+    parser.add_argument(
+        '--no-default-excludes',
+        action='store_true',
+        help='Also traverse VCS metadata, virtualenv, node_modules and tool cache directories'
+    )
+    parser.add_argument(
+        '--include-ext',
+        action='append',
+        type=parse_suffix,
+        metavar='EXT',
+        help='Only process files with this extension (repeatable, e.g. --include-ext py)'
+    )
+    parser.add_argument(
+        '--exclude-ext',
+        action='append',
+        type=parse_suffix,
+        metavar='EXT',
+        help='Skip files with this extension without opening them (repeatable; added to the built-in binary list)'
+    )
+    parser.add_argument(
+        '--no-ignore',
+        action='store_true',
+        help='Do not skip files and directories matched by .gitignore or .nomoemoignore files'
+    )
+    parser.add_argument(
+        '--archives',
+        action='store_true',
+        help='Scan the members of .zip and .tar (.tar.gz/.tgz, .tar.bz2/.tbz2, .tar.xz/.txz) archives in memory, '
+             'reported as ARCHIVE!MEMBER (scan modes only)'
+    )
+    parser.add_argument(
+        '--archive-max-member-size',
+        type=parse_size,
+        default=DEFAULT_ARCHIVE_MEMBER_SIZE,
+        metavar='SIZE',
+        help='Skip archive members larger than SIZE, with a warning (K/M/G suffixes allowed, default: 16M)'
+    )
+    parser.add_argument(
+        '--archive-max-members',
+        type=int,
+        default=DEFAULT_ARCHIVE_MEMBERS,
+        metavar='N',
+        help='Stop scanning an archive after N members, with a warning (default: 10000)'
+    )
+    
+    # Git-aware file selection
+    git_group = parser.add_mutually_exclusive_group()
+    git_group.add_argument(
+        '--changed-since',
+        metavar='REF',
+        help='Only process files that git reports as added, modified or renamed since REF'
+    )
+    git_group.add_argument(
+        '--staged',
+        action='store_true',
+        help='Only process files that are added, modified or renamed in the git index'
+    )
+    parser.add_argument(
+        '--stream-threshold',
+        type=parse_size,
+        default=DEFAULT_STREAM_THRESHOLD,
+        metavar='SIZE',
+        help='Scan files of at least SIZE bytes in bounded-memory chunks (K/M/G suffixes allowed, default: 16M)'
+    )
+    parser.add_argument(
+        '--no-mmap',
+        action='store_true',
+        help='Read large files instead of memory-mapping them in read-only modes'
+    )
+    parser.add_argument(
+        '--fsync',
+        action='store_true',
+        help='Flush rewritten files and their directories to disk before reporting success (--remove/--replace)'
+    )
+    parser.add_argument(
+        '--cache',
+        metavar='FILE',
+        help='Reuse scan results for unchanged files from this cache database (created if missing)'
+    )
+    parser.add_argument(
+        '--cache-hash',
+        action='store_true',
+        help='Also match cache entries by content hash when file metadata changed (e.g. fresh checkouts)'
+    )
+    parser.add_argument(
+        '--cache-size',
+        type=parse_size,
+        default=DEFAULT_CACHE_SIZE,
+        metavar='SIZE',
+        help='Evict least recently used cache entries beyond SIZE bytes (default: 64M)'
+    )
+    parser.add_argument(
+        '--format',
+        choices=('text', 'jsonl', 'sarif'),
+        help='Write one record per finding to stdout (or --output) instead of logging it: '
+             'path:line:col text lines, JSON Lines or SARIF 2.1.0 (scan modes only)'
+    )
+    parser.add_argument(
+        '--output', '-o',
+        metavar='FILE',
+        help='Write --format records to FILE instead of stdout'
+    )
+    parser.add_argument(
+        '--max-findings-per-file',
+        type=int,
+        metavar='N',
+        help='Report and keep at most N findings per file (counts stay exact)'
+    )
+    parser.add_argument(
+        '--stats',
+        nargs='?',
+        const='table',
+        choices=('table', 'json'),
+        help='Print wall/CPU time per phase, bytes read and written, file outcomes and the slowest files '
+             'to stderr at the end (default: table)'
+    )
+    parser.add_argument(
+        '--stats-slowest',
+        type=int,
+        default=10,
+        metavar='N',
+        help='Number of slowest files listed by --stats (default: 10)'
+    )
+    parser.add_argument(
+        '--profile',
+        metavar='FILE',
+        help='Run under cProfile and write the profile to FILE (pstats format; the parent process only)'
+    )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=1,
+        metavar='N',
+        help='Process files with N worker processes (0 = one per CPU, default: 1)'
+    )
+    
+    # Watch options
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='After scanning, keep running and rescan the files whose size or mtime changes, '
+             'reporting only new and fixed findings (scan modes only)'
+    )
+    parser.add_argument(
+        '--watch-interval',
+        type=float,
+        default=1.0,
+        metavar='SECONDS',
+        help='Seconds between change sweeps with --watch (default: 1.0)'
+    )
+    parser.add_argument(
+        '--watch-debounce',
+        type=float,
+        default=0.3,
+        metavar='SECONDS',
+        help='With --watch, wait until a change sweep finds nothing new for this long before '
+             'rescanning (default: 0.3)'
+    )
+    
+    # Daemon options
+    parser.add_argument(
+        '--serve',
+        action='store_true',
+        help='Run as a daemon that keeps the emoji matcher loaded and runs --daemon requests '
+             'on a Unix domain socket, until interrupted'
+    )
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help='Run on a --serve daemon if one is listening, otherwise in this process '
+             '(--remove/--replace without --force always run here, to prompt)'
+    )
+    parser.add_argument(
+        '--socket',
+        metavar='PATH',
+        help='Socket of --serve and --daemon (default: $XDG_RUNTIME_DIR/nomoemo.sock, '
+             'or daemon.sock in a private nomoemo-UID directory under the temporary directory)'
+    )
+    
     # Logging options
     log_group = parser.add_mutually_exclusive_group()
     log_group.add_argument(
@@ -604,16 +3087,397 @@ NOTES:
     return parser
 
 
-def main() -> int:
-    """Main entry point."""
+@functools.lru_cache(maxsize=None)
+def _default_options() -> Tuple[Tuple[str, object], ...]:
+    """Destination names and defaults of every command line option."""
+    parser = create_argument_parser()
+    return tuple((action.dest, action.default) for action in parser._actions
+                 if action.dest not in ('help', 'version'))
+
+
+def default_args(**options) -> argparse.Namespace:
+    """Return the arguments of a plain command line run, overridden by options.
+    
+    Options are named by their destination (``recursive=True``,
+    ``exclude_dir=['build']``, ``jobs=4``). Without a mode option the run is
+    a dry run, as on the command line.
+    """
+    args = argparse.Namespace(**dict(_default_options()))
+    for name, value in options.items():
+        if not hasattr(args, name):
+            raise TypeError(f"unknown option: '{name}'")
+        setattr(args, name, value)
+    if not (args.dry_run or args.remove or args.replace or args.ascii_only or args.latin1_only):
+        args.dry_run = True
+    return args
+
+
+class Finding:
+    """A single emoji or character set violation, as returned by the library API.
+    
+    ``rule`` is 'emoji', 'non-ascii' or 'non-latin1'; ``text`` is the emoji
+    sequence or violating character and ``context`` the surrounding text
+    with it masked. ``line`` and ``column`` are 1-based, ``path`` is None
+    for scan_text().
+    """
+    
+    __slots__ = ('path', 'line', 'column', 'rule', 'text', 'context')
+    
+    def __init__(self, path, line: int, column: int, rule: str, text: str, context: str):
+        self.path = path
+        self.line = line
+        self.column = column
+        self.rule = rule
+        self.text = text
+        self.context = context
+    
+    @property
+    def codepoint(self) -> str:
+        """The 'U+XXXX' codepoints of text, space separated."""
+        return ' '.join(f'U+{ord(char):04X}' for char in self.text)
+    
+    def __repr__(self) -> str:
+        return f"Finding({self.path!r}, line={self.line}, column={self.column}, rule={self.rule!r}, text={self.text!r})"
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Finding):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+
+# Library API: scan modes and the rule reported for each
+SCAN_MODES = {'emoji': 'emoji', 'ascii': 'non-ascii', 'latin1': 'non-latin1'}
+
+# NoMoEmo instance behind the single-file library functions, created on first use
+_api_app = None
+
+
+def _get_api_app() -> NoMoEmo:
+    global _api_app
+    if _api_app is None:
+        _api_app = NoMoEmo(worker=True, verbose=True)
+    return _api_app
+
+
+def _processor(app: NoMoEmo, result: FileResult, mode: str) -> Callable[[str, int, bool, LineIndex], int]:
+    if mode not in SCAN_MODES:
+        raise ValueError(f"Unknown mode: '{mode}' (expected one of {', '.join(SCAN_MODES)})")
+    if mode == 'emoji':
+        return app._emoji_processor(result)
+    return app._charset_processor(result, mode)
+
+
+def _findings(result: FileResult, mode: str, path) -> List[Finding]:
+    """Convert a FileResult's finding tuples to Finding objects."""
+    if mode == 'emoji':
+        return [Finding(path, line, col, 'emoji', found, context)
+                for line, col, context, found in result.findings]
+    rule = SCAN_MODES[mode]
+    return [Finding(path, line, col, rule, char, context)
+            for char, codepoint, line, col, context in result.findings]
+
+
+def scan_text(text: str, mode: str = 'emoji') -> List[Finding]:
+    """Return the findings in a string.
+    
+    ``mode`` is 'emoji', 'ascii' (characters above U+007F) or 'latin1'
+    (above U+00FF). The emoji matcher is loaded once per process and kept.
+    """
+    app = _get_api_app()
+    result = FileResult(None)
+    app._scan_string(text, _processor(app, result, mode))
+    return _findings(result, mode, None)
+
+
+def scan_file(path, mode: str = 'emoji') -> List[Finding]:
+    """Return the findings in a file; binary files have none.
+    
+    UTF-16, UTF-32 and Latin-1 files are decoded as such (see
+    _classify_text). Raises OSError if the file cannot be read and
+    UnicodeDecodeError if it does not decode in the encoding its first
+    bytes suggest.
+    """
+    app = _get_api_app()
+    result = FileResult(Path(path))
+    app._scan_text(result.path, _processor(app, result, mode))
+    return _findings(result, mode, path)
+
+
+def iter_findings(paths, mode: str = 'emoji', recursive: bool = True, **options) -> Iterator[Finding]:
+    """Yield the findings in files and directory trees, file by file in traversal order.
+    
+    ``paths`` is a path or an iterable of paths. Directories are walked
+    like on the command line (default excludes, ignore files); further
+    command line options can be given by destination name, e.g.
+    ``jobs=4``, ``exclude_dir=['build']`` or ``archives=True`` (findings in
+    archive members have paths like ``dist.zip!src/main.c``). Files that
+    cannot be read are skipped with a warning on the 'nomoemo' logger.
+    """
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+    if mode not in SCAN_MODES:
+        raise ValueError(f"Unknown mode: '{mode}' (expected one of {', '.join(SCAN_MODES)})")
+    app = NoMoEmo(worker=True, verbose=True, recursive=recursive, **options)
+    logger = logging.getLogger('nomoemo')
+    
+    files = itertools.chain.from_iterable(app._get_files_to_process(Path(path)) for path in paths)
+    if mode == 'emoji':
+        results = app._map_files('_scan_file_for_emojis', files)
+    else:
+        results = app._map_files('_scan_file_for_charset_violations', files, mode)
+    for result in results:
+        for member in result.members or ():
+            if member.error:
+                logger.warning(member.error)
+            else:
+                yield from _findings(member, mode, member.path)
+        if result.error:
+            logger.warning(result.error)
+            continue
+        yield from _findings(result, mode, result.path)
+
+
+def rewrite_file(path, replacement: str = '') -> int:
+    """Remove the emojis in a file, or replace each with replacement; return how many there were.
+    
+    Only the emoji bytes change (files in other encodings than UTF-8 are
+    written back in theirs) and the file is replaced atomically (see
+    _atomic_write). Binary files are left alone and count as 0. Raises
+    OSError or UnicodeDecodeError like scan_file.
+    """
+    app = _get_api_app()
+    if app.emoji_matcher.find_spans(replacement):
+        raise ValueError("replacement cannot contain an emoji")
+    result = FileResult(Path(path))
+    app._rewrite(result, replacement)
+    return result.count
+
+
+# How long --daemon waits to connect before running in-process
+DAEMON_CONNECT_TIMEOUT = 0.5
+
+
+def default_socket_path() -> str:
+    """The socket --serve listens on and --daemon connects to without --socket.
+    
+    That is nomoemo.sock in $XDG_RUNTIME_DIR, or else daemon.sock in a
+    per-user directory under the temp directory, which --serve creates
+    with owner-only permissions.
+    """
+    import tempfile
+    
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        return os.path.join(runtime_dir, 'nomoemo.sock')
+    return os.path.join(tempfile.gettempdir(), f'nomoemo-{os.getuid()}', 'daemon.sock')
+
+
+def _foreign_socket(socket_path: str) -> bool:
+    """Tell whether something other than a socket of the current user sits at socket_path."""
+    try:
+        path_stat = os.lstat(socket_path)
+    except OSError:
+        return False
+    return not stat.S_ISSOCK(path_stat.st_mode) or path_stat.st_uid != os.getuid()
+
+
+def _connect_daemon(socket_path: str) -> Optional['socket.socket']:
+    """Return a connection to the daemon on socket_path, or None if none is listening.
+    
+    Only a socket owned by the current user is trusted, and on Linux the
+    listening process must run as the current user too: otherwise another
+    local user could bind the path first, receive the command lines and
+    working directories, and answer with any exit code.
+    """
+    import socket
+    
+    if not hasattr(socket, 'AF_UNIX'):
+        return None
+    if _foreign_socket(socket_path):
+        sys.stderr.write(f"[WARNING] Ignoring {socket_path}: not a socket owned by the current user\n")
+        return None
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(DAEMON_CONNECT_TIMEOUT)
+    try:
+        client.connect(socket_path)
+        if hasattr(socket, 'SO_PEERCRED'):
+            import struct
+            
+            credentials = client.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize('3i'))
+            _, peer_uid, _ = struct.unpack('3i', credentials)
+            if peer_uid != os.getuid():
+                sys.stderr.write(f"[WARNING] Ignoring {socket_path}: the daemon runs as another user\n")
+                client.close()
+                return None
+    except OSError:
+        client.close()
+        return None
+    client.settimeout(None)
+    return client
+
+
+def _run_via_daemon(socket_path: str, argv: List[str]) -> Optional[int]:
+    """Run a command line on a --serve daemon and relay its output.
+    
+    The request is one JSON line with argv and the working directory; the
+    reply is one JSON line with the exit code and the captured stdout and
+    stderr. Returns the exit code, or None if no daemon answered.
+    """
+    client = _connect_daemon(socket_path)
+    if client is None:
+        return None
+    with client:
+        request = json.dumps({'argv': argv, 'cwd': os.getcwd()}) + '\n'
+        try:
+            client.sendall(request.encode('utf-8'))
+            with client.makefile('r', encoding='utf-8') as reader:
+                line = reader.readline()
+        except OSError:
+            return None
+    if not line:
+        return None
+    response = json.loads(line)
+    sys.stdout.write(response['stdout'])
+    sys.stderr.write(response['stderr'])
+    return response['exit']
+
+
+def _run_captured(argv: List[str], cwd: str) -> dict:
+    """Run one command line in this process from cwd, capturing its exit code and output."""
+    stdout, stderr = io.StringIO(), io.StringIO()
+    previous_cwd, previous_stdin = os.getcwd(), sys.stdin
+    sys.stdin = io.StringIO()  # Prompts read EOF and decline
+    try:
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                os.chdir(cwd)
+                code = main(argv, in_daemon=True)
+            except SystemExit as e:
+                if isinstance(e.code, str):
+                    stderr.write(e.code + '\n')
+                code = e.code if isinstance(e.code, int) else int(e.code is not None)
+            except OSError as e:
+                stderr.write(f"[ERROR] {e}\n")
+                code = 1
+    finally:
+        sys.stdin = previous_stdin
+        os.chdir(previous_cwd)
+        # Release the request's console and --log handlers
+        logger = logging.getLogger('nomoemo')
+        for handler in logger.handlers:
+            handler.close()
+        logger.handlers.clear()
+    return {'exit': code, 'stdout': stdout.getvalue(), 'stderr': stderr.getvalue()}
+
+
+def _answer_daemon_request(rfile, wfile):
+    """Read one --daemon request, run it and write the reply (see _run_via_daemon)."""
+    line = rfile.readline()
+    if not line:
+        return
+    try:
+        request = json.loads(line)
+        response = _run_captured([str(arg) for arg in request['argv']], request['cwd'])
+    except (ValueError, KeyError, TypeError) as e:
+        response = {'exit': 1, 'stdout': '', 'stderr': f"[ERROR] Bad daemon request: {e}\n"}
+    wfile.write((json.dumps(response) + '\n').encode('utf-8'))
+
+
+def serve(socket_path: str) -> int:
+    """Serve --daemon requests on a Unix domain socket until interrupted or terminated.
+    
+    The emoji matcher is loaded once up front, so each request costs only
+    its own scan. Requests run one at a time, each from the client's
+    working directory; the socket is only accessible to the current user.
+    A missing parent directory (such as the per-user one of
+    default_socket_path) is created with owner-only permissions.
+    """
+    import signal
+    import socket
+    import socketserver
+    
+    class DaemonHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            _answer_daemon_request(self.rfile, self.wfile)
+    
+    if not hasattr(socket, 'AF_UNIX'):
+        sys.stderr.write("[ERROR] --serve needs Unix domain socket support\n")
+        return 1
+    if _foreign_socket(socket_path):
+        sys.stderr.write(f"[ERROR] {socket_path} is not a socket owned by the current user; "
+                         f"remove it or choose another --socket\n")
+        return 1
+    directory = os.path.dirname(os.path.abspath(socket_path))
+    if not os.path.isdir(directory):
+        try:
+            os.mkdir(directory, 0o700)
+        except OSError as e:
+            sys.stderr.write(f"[ERROR] Cannot create {directory}: {e}\n")
+            return 1
+    if os.path.exists(socket_path):
+        client = _connect_daemon(socket_path)
+        if client is not None:
+            client.close()
+            sys.stderr.write(f"[ERROR] A daemon is already listening on {socket_path}\n")
+            return 1
+        os.unlink(socket_path)  # Left behind by a daemon that was killed
+    
+    get_emoji_matcher()
+    previous_umask = os.umask(0o177)
+    try:
+        server = socketserver.UnixStreamServer(socket_path, DaemonHandler)
+    except OSError as e:
+        sys.stderr.write(f"[ERROR] Cannot listen on {socket_path}: {e}\n")
+        return 1
+    finally:
+        os.umask(previous_umask)
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    sys.stderr.write(f"[INFO] Listening on {socket_path}\n")
+    sys.stderr.flush()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        with contextlib.suppress(OSError):
+            os.unlink(socket_path)
+    sys.stderr.write("[INFO] Daemon stopped\n")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None, in_daemon: bool = False) -> int:
+    """Main entry point; in_daemon is set for requests run by a --serve daemon."""
     parser = create_argument_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    
+    if args.serve:
+        if in_daemon:
+            parser.error('--serve cannot be sent to a daemon')
+        return serve(args.socket or default_socket_path())
+    if args.target is None and not args.stdin:
+        parser.error('the following arguments are required: target')
     
     # Default to dry-run if no mode specified
     if not (args.dry_run or args.remove or args.replace or args.ascii_only or args.latin1_only):
         args.dry_run = True
     
+    # Watch sessions, standard input and rewrites that would prompt for confirmation stay in this process
+    stays_local = (args.watch or args.stdin or args.target == '-'
+                   or ((args.remove or args.replace) and not args.force))
+    if args.daemon and not in_daemon and not stays_local:
+        code = _run_via_daemon(args.socket or default_socket_path(), sys.argv[1:] if argv is None else argv)
+        if code is not None:
+            return code
+    
     app = NoMoEmo(args)
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(app.run)
+        finally:
+            profiler.dump_stats(args.profile)
     return app.run()
 
 
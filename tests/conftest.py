@@ -0,0 +1,22 @@
+"""Shared test setup: the repository root on sys.path and a helper that runs the command line tool."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+NOMOEMO = ROOT / 'nomoemo.py'
+
+sys.path.insert(0, str(ROOT))
+
+
+def run_nomoemo(*args: str, cwd=None, input: bytes = None, **kwargs) -> subprocess.CompletedProcess:
+    """Run nomoemo.py in a fresh interpreter, capturing its output.
+    
+    Output is decoded as UTF-8 text, unless input (bytes for stdin) is
+    given; then stdout and stderr stay bytes too.
+    """
+    if input is None:
+        kwargs.update(text=True, encoding='utf-8')
+    return subprocess.run([sys.executable, str(NOMOEMO), *args], cwd=cwd, input=input, capture_output=True,
+                          **kwargs)
@@ -0,0 +1,55 @@
+"""Tests for the in-process library API."""
+
+from pathlib import Path
+
+import pytest
+
+import nomoemo
+
+
+def test_scan_text_emoji_sequences():
+    findings = nomoemo.scan_text('a \U0001F600\r\nb \U0001F44D\U0001F3FD c')
+    assert [(f.line, f.column, f.rule, f.text) for f in findings] == [
+        (1, 3, 'emoji', '\U0001F600'),
+        (2, 3, 'emoji', '\U0001F44D\U0001F3FD'),
+    ]
+    assert findings[0].path is None
+    assert findings[1].codepoint == 'U+1F44D U+1F3FD'
+
+
+def test_scan_text_charsets():
+    assert [f.text for f in nomoemo.scan_text('caf\u00e9 \u4e2d', 'ascii')] == ['\u00e9', '\u4e2d']
+    assert [f.rule for f in nomoemo.scan_text('caf\u00e9 \u4e2d', 'latin1')] == ['non-latin1']
+    with pytest.raises(ValueError):
+        nomoemo.scan_text('x', 'cp1252')
+
+
+def test_scan_file_and_rewrite_file(tmp_path: Path):
+    path = tmp_path / 'sample.py'
+    path.write_bytes('x = "\U0001F680"\r\n'.encode('utf-8'))
+    assert [f.line for f in nomoemo.scan_file(path)] == [1]
+    assert nomoemo.rewrite_file(path, '*') == 1
+    assert path.read_bytes() == b'x = "*"\r\n'
+    assert nomoemo.scan_file(path) == []
+    with pytest.raises(OSError):
+        nomoemo.scan_file(tmp_path / 'missing.py')
+    with pytest.raises(ValueError):
+        nomoemo.rewrite_file(path, '\U0001F600')
+
+
+def test_iter_findings_walks_trees(tmp_path: Path):
+    (tmp_path / 'sub').mkdir()
+    (tmp_path / 'a.py').write_text('\U0001F600\n', encoding='utf-8')
+    (tmp_path / 'sub' / 'b.py').write_text('x\n\u2705\n', encoding='utf-8')
+    (tmp_path / 'build').mkdir()
+    (tmp_path / 'build' / 'c.py').write_text('\U0001F600\n', encoding='utf-8')
+    findings = list(nomoemo.iter_findings(tmp_path, exclude_dir=['build']))
+    assert [(f.path.name, f.line) for f in findings] == [('a.py', 1), ('b.py', 2)]
+    assert len(list(nomoemo.iter_findings([tmp_path], recursive=False))) == 1
+
+
+def test_nomoemo_without_argparse():
+    app = nomoemo.NoMoEmo(worker=True, ascii_only=True)
+    assert app.args.ascii_only and not app.args.dry_run
+    with pytest.raises(TypeError):
+        nomoemo.NoMoEmo(no_such_option=True)
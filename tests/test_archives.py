@@ -0,0 +1,67 @@
+"""Tests for --archives, against archives built in a temporary directory."""
+
+import io
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+import nomoemo
+from conftest import run_nomoemo
+
+MEMBERS = {
+    'src/main.c': '// \U0001F680 launch\n'.encode('utf-8'),
+    'docs/notes.txt': 'caf\u00e9\n'.encode('utf-8'),
+    'assets/logo.bin': b'\x00\x01' + '\U0001F600'.encode('utf-8'),
+    '.git/HEAD.c': '\U0001F600\n'.encode('utf-8'),
+}
+
+
+@pytest.fixture
+def archives(tmp_path: Path) -> Path:
+    with zipfile.ZipFile(tmp_path / 'release.zip', 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, data in MEMBERS.items():
+            archive.writestr(name, data)
+    for name, mode in (('sdk.tar.gz', 'w:gz'), ('sdk.tar.xz', 'w:xz')):
+        with tarfile.open(tmp_path / name, mode) as archive:
+            for member_name, data in MEMBERS.items():
+                info = tarfile.TarInfo(member_name)
+                info.size = len(data)
+                archive.addfile(info, io.BytesIO(data))
+    return tmp_path
+
+
+def test_archives_are_skipped_by_default(archives: Path):
+    completed = run_nomoemo('--recursive', '.', cwd=archives)
+    assert 'No files found to process.' in completed.stderr
+
+
+def test_findings_are_reported_per_member(archives: Path):
+    completed = run_nomoemo('--archives', '--recursive', '--ascii-only', '--format', 'text', '.', cwd=archives)
+    assert completed.returncode == 0
+    assert completed.stdout.splitlines() == [
+        f'{archive}!{line}' for archive in ('release.zip', 'sdk.tar.gz', 'sdk.tar.xz') for line in (
+            'src/main.c:1:4: non-ascii U+1F680: // [U+1F680] launch ',
+            'docs/notes.txt:1:4: non-ascii U+00E9: caf[U+00E9] ',
+        )
+    ]
+
+
+def test_member_limits(archives: Path):
+    completed = run_nomoemo('--archives', '--archive-max-member-size', '8', 'release.zip', cwd=archives)
+    assert 'Skipped release.zip!src/main.c: larger than --archive-max-member-size' in completed.stderr
+    assert 'Total: 0 emojis in 0 files.' in completed.stderr
+    completed = run_nomoemo('--archives', '--archive-max-members', '1', 'release.zip', cwd=archives)
+    assert 'Stopped scanning release.zip after 1 members' in completed.stderr
+    assert 'Total: 1 emojis in 1 files.' in completed.stderr
+
+
+def test_archives_are_never_rewritten(archives: Path):
+    completed = run_nomoemo('--archives', '--remove', '--force', 'release.zip', cwd=archives)
+    assert completed.returncode == 1
+
+
+def test_iter_findings_with_archives(archives: Path):
+    findings = list(nomoemo.iter_findings(archives / 'sdk.tar.gz', archives=True))
+    assert [(f.path, f.line, f.column) for f in findings] == [(archives / 'sdk.tar.gz!src/main.c', 1, 4)]
@@ -0,0 +1,17 @@
+"""Tests for the --cache database."""
+
+from pathlib import Path
+
+from conftest import run_nomoemo
+
+
+def test_cache_database_in_the_tree_is_not_scanned(tmp_path: Path):
+    (tmp_path / 'a.py').write_text('caf\u00e9\n', encoding='utf-8')
+    # A leftover journal of a run still in progress, with non-ASCII text in it
+    (tmp_path / '.nomoemo-cache-journal').write_text('caf\u00e9\n', encoding='utf-8')
+    for _ in range(2):
+        completed = run_nomoemo('--cache', '.nomoemo-cache', '--ascii-only', '--recursive', '.', cwd=tmp_path)
+        assert 'Found 1 non-ASCII character(s) in a.py' in completed.stderr
+        assert '.nomoemo-cache' not in completed.stderr
+        assert 'Processed 1 files.' in completed.stderr
+    assert (tmp_path / '.nomoemo-cache').is_file()
@@ -0,0 +1,101 @@
+"""Tests for the --serve daemon and the --daemon client."""
+
+import os
+import socket
+import stat
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+import nomoemo
+from conftest import NOMOEMO, run_nomoemo
+
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason='no Unix domain sockets')
+
+
+@pytest.fixture
+def daemon(tmp_path: Path):
+    """A running daemon; yields its socket path."""
+    yield from run_daemon(tmp_path / 'nomoemo.sock')
+
+
+def run_daemon(socket_path: Path):
+    process = subprocess.Popen([sys.executable, str(NOMOEMO), '--serve', '--socket', str(socket_path)],
+                               stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while not socket_path.exists():
+        assert process.poll() is None and time.monotonic() < deadline, 'daemon did not start'
+        time.sleep(0.05)
+    yield str(socket_path)
+    process.terminate()
+    assert process.wait(timeout=10) == 0
+    assert not socket_path.exists()
+
+
+def test_request_runs_in_daemon_from_client_directory(daemon, tmp_path: Path, monkeypatch, capsys):
+    (tmp_path / 'a.py').write_text('# \U0001F600\n', encoding='utf-8')
+    monkeypatch.chdir(tmp_path)
+    code = nomoemo._run_via_daemon(daemon, ['--daemon', '--format', 'jsonl', 'a.py'])
+    captured = capsys.readouterr()
+    assert code == 0
+    assert '"path": "a.py", "line": 1, "column": 3' in captured.out
+    assert '[+] Total: 1 emojis in 1 files.' in captured.err
+
+
+def test_request_errors_are_relayed(daemon, tmp_path: Path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    assert nomoemo._run_via_daemon(daemon, ['missing.py']) == 1
+    assert 'Target path does not exist' in capsys.readouterr().err
+    assert nomoemo._run_via_daemon(daemon, ['--serve']) == 2
+
+
+def test_second_daemon_refuses_live_socket(daemon):
+    completed = run_nomoemo('--serve', '--socket', daemon, timeout=30)
+    assert completed.returncode == 1
+    assert 'already listening' in completed.stderr
+
+
+def test_client_falls_back_without_daemon(tmp_path: Path):
+    (tmp_path / 'a.py').write_text('# \U0001F600\n', encoding='utf-8')
+    socket_path = tmp_path / 'none.sock'
+    assert nomoemo._run_via_daemon(str(socket_path), ['a.py']) is None
+    completed = run_nomoemo('--daemon', '--socket', str(socket_path), 'a.py', cwd=tmp_path)
+    assert completed.returncode == 0
+    assert 'Found 1 emoji(s) in a.py' in completed.stderr
+
+
+def test_default_socket_lives_in_a_private_directory(tmp_path: Path, monkeypatch):
+    monkeypatch.delenv('XDG_RUNTIME_DIR', raising=False)
+    path = Path(nomoemo.default_socket_path())
+    assert (path.parent.name, path.name) == (f'nomoemo-{os.getuid()}', 'daemon.sock')
+    
+    socket_path = tmp_path / 'private' / 'daemon.sock'
+    for _ in run_daemon(socket_path):
+        assert stat.S_IMODE(socket_path.parent.stat().st_mode) == 0o700
+
+
+def test_socket_path_held_by_something_else_is_not_trusted(tmp_path: Path, capsys):
+    socket_path = tmp_path / 'nomoemo.sock'
+    socket_path.write_text('not a socket\n', encoding='utf-8')
+    assert nomoemo._run_via_daemon(str(socket_path), ['a.py']) is None
+    assert 'not a socket owned by the current user' in capsys.readouterr().err
+    completed = run_nomoemo('--serve', '--socket', str(socket_path), timeout=30)
+    assert completed.returncode == 1
+    assert 'not a socket owned by the current user' in completed.stderr
+    assert socket_path.read_text(encoding='utf-8') == 'not a socket\n'
+
+
+@pytest.mark.skipif(not hasattr(os, 'geteuid') or os.geteuid() != 0,
+                    reason='needs root to create a socket owned by another user')
+def test_socket_of_another_user_is_not_trusted(tmp_path: Path, capsys):
+    socket_path = tmp_path / 'nomoemo.sock'
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+        listener.bind(str(socket_path))
+        listener.listen()
+        os.chown(socket_path, 65534, 65534)
+        assert nomoemo._run_via_daemon(str(socket_path), ['a.py']) is None
+    assert 'not a socket owned by the current user' in capsys.readouterr().err
@@ -0,0 +1,74 @@
+"""Tests for reading and rewriting files in encodings other than UTF-8."""
+
+import codecs
+from pathlib import Path
+
+import pytest
+
+import nomoemo
+from conftest import run_nomoemo
+
+TEXT = 'x = 1  # caf\u00e9 \U0001F600\r\ny = "\u2705"\r\n'
+
+
+@pytest.mark.parametrize('head, expected', [
+    (TEXT.encode('utf-8'), 'utf-8'),
+    (codecs.BOM_UTF8 + TEXT.encode('utf-8'), 'utf-8'),
+    (codecs.BOM_UTF16_LE + TEXT.encode('utf-16-le'), 'utf-16'),
+    (codecs.BOM_UTF16_BE + TEXT.encode('utf-16-be'), 'utf-16'),
+    (codecs.BOM_UTF32_LE + TEXT.encode('utf-32-le'), 'utf-32'),
+    (TEXT.encode('utf-16-le'), 'utf-16-le'),
+    (TEXT.encode('utf-16-be'), 'utf-16-be'),
+    ('caf\u00e9 na\u00efve\n'.encode('latin-1'), 'latin-1'),
+    (b'\x00\x01\x02\x03' * 64, None),
+    (bytes(range(256)), None),
+    (b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR', None),
+])
+def test_classify_text(head: bytes, expected):
+    assert nomoemo._classify_text(head, True) == expected
+
+
+@pytest.mark.parametrize('bom, codec', [
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be'),
+    (codecs.BOM_UTF32_BE, 'utf-32-be'),
+    (b'', 'utf-16-le'),
+])
+def test_scan_and_rewrite_keep_the_encoding(tmp_path: Path, bom: bytes, codec: str):
+    path = tmp_path / 'wide.py'
+    path.write_bytes(bom + TEXT.encode(codec))
+    assert [(f.line, f.column, f.text) for f in nomoemo.scan_file(path)] == [
+        (1, 15, '\U0001F600'), (2, 6, '\u2705')]
+    assert [f.text for f in nomoemo.scan_file(path, 'ascii')] == ['\u00e9', '\U0001F600', '\u2705']
+    assert nomoemo.rewrite_file(path, '*') == 2
+    assert path.read_bytes() == bom + 'x = 1  # caf\u00e9 *\r\ny = "*"\r\n'.encode(codec)
+
+
+def test_latin1_file_is_scanned(tmp_path: Path):
+    path = tmp_path / 'legacy.c'
+    data = '/* r\u00e9sum\u00e9 */\nint x;\n'.encode('latin-1')
+    path.write_bytes(data)
+    assert [(f.line, f.column, f.text) for f in nomoemo.scan_file(path, 'ascii')] == [
+        (1, 5, '\u00e9'), (1, 9, '\u00e9')]
+    assert nomoemo.scan_file(path, 'latin1') == []
+    assert nomoemo.rewrite_file(path) == 0
+    assert path.read_bytes() == data
+
+
+def test_streamed_utf16_file_matches_in_memory_scan(tmp_path: Path):
+    text = ('a' * 101 + '\U0001F468\u200d\U0001F469\u200d\U0001F467\n') * 20000
+    path = tmp_path / 'big.txt'
+    path.write_bytes(codecs.BOM_UTF16_BE + text.encode('utf-16-be'))
+    app = nomoemo.NoMoEmo(worker=True, verbose=True, stream_threshold=64 * 1024)
+    result = app._scan_file_for_emojis(path)
+    assert result.error is None and result.count == 20000
+    assert result.findings[-1][:2] == (20000, 102)
+
+
+def test_stdin_filter_writes_back_in_the_input_encoding():
+    data = codecs.BOM_UTF16_BE + (TEXT * 50000).encode('utf-16-be')
+    completed = run_nomoemo('--remove', '-', input=data)
+    assert completed.returncode == 0
+    assert completed.stdout == codecs.BOM_UTF16_BE + (TEXT * 50000).replace('\U0001F600', '').replace(
+        '\u2705', '').encode('utf-16-be')
+    assert b'Removed 100000 emojis from <stdin>' in completed.stderr
@@ -0,0 +1,40 @@
+"""Tests for the compact charset findings store."""
+
+import json
+import pickle
+
+import nomoemo
+
+
+def scan(text: str, **options) -> nomoemo.FileResult:
+    app = nomoemo.NoMoEmo(worker=True, ascii_only=True, **options)
+    result = nomoemo.FileResult(None)
+    app._scan_string(text, app._charset_processor(result, 'ascii'))
+    return result
+
+
+def test_histogram_without_details():
+    result = scan('caf\u00e9 na\u00efve \u00e9t\u00e9\n')
+    assert result.count == 4
+    assert len(result.findings) == 0
+    assert result.findings.histogram == {'\u00e9': 3, '\u00ef': 1}
+
+
+def test_details_are_capped_but_counted():
+    result = scan('\u00e9\n\u00e8\n\u00ea\n', verbose=True, max_findings_per_file=2)
+    assert result.count == 3
+    assert [(char, line, col) for char, _, line, col, _ in result.findings] == [('\u00e9', 1, 1), ('\u00e8', 2, 1)]
+    assert sum(result.findings.histogram.values()) == 3
+
+
+def test_twelve_bytes_per_violation():
+    findings = scan('\U0010FFFF\n', verbose=True).findings
+    assert list(findings)[0][1:4] == (0x10FFFF, 1, 1)
+    assert sum(values.itemsize for values in (findings.codepoints, findings.lines, findings.columns)) == 12
+
+
+def test_round_trips():
+    findings = scan('x \u4e2d\n', verbose=True).findings
+    copy = nomoemo.CharsetFindings.from_json(json.loads(json.dumps(findings.to_json())))
+    assert list(copy) == list(findings) == [('\u4e2d', 0x4E2D, 1, 3, 'x [U+4E2D] ')]
+    assert list(pickle.loads(pickle.dumps(findings))) == list(findings)
@@ -0,0 +1,72 @@
+"""Tests for --changed-since and --staged, run against a temporary git repository."""
+
+import re
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from conftest import run_nomoemo
+
+FOUND_REGEX = re.compile(r'\[-\] Found \d+ emoji\(s\) in (.+)$', re.MULTILINE)
+
+pytestmark = pytest.mark.skipif(shutil.which('git') is None, reason='git is not installed')
+
+
+def git(repo: Path, *args: str) -> str:
+    completed = subprocess.run(['git', *args], cwd=repo, capture_output=True, text=True, check=True)
+    return completed.stdout
+
+
+def found_files(completed: subprocess.CompletedProcess) -> set:
+    output = completed.stdout + completed.stderr
+    return {Path(name).as_posix() for name in FOUND_REGEX.findall(output)}
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    """A repository with one commit of emoji files, then one staged and one unstaged change."""
+    git(tmp_path, 'init', '-q')
+    git(tmp_path, 'config', 'user.email', 'test@example.com')
+    git(tmp_path, 'config', 'user.name', 'Test')
+    (tmp_path / 'src').mkdir()
+    for name in ('old.py', 'src/old.py'):
+        (tmp_path / name).write_text('# \U0001F600\n', encoding='utf-8')
+    git(tmp_path, 'add', '.')
+    git(tmp_path, 'commit', '-q', '-m', 'initial')
+
+    (tmp_path / 'src' / 'staged.py').write_text('# \U0001F680\n', encoding='utf-8')
+    git(tmp_path, 'add', 'src/staged.py')
+    (tmp_path / 'old.py').write_text('# \U0001F600 ✅\n', encoding='utf-8')
+    return tmp_path
+
+
+def test_staged_reports_only_index_changes(repo: Path):
+    completed = run_nomoemo('--staged', '--recursive', '.', cwd=repo)
+    assert completed.returncode == 0
+    assert found_files(completed) == {'src/staged.py'}
+
+
+def test_changed_since_reports_working_tree_changes(repo: Path):
+    completed = run_nomoemo('--changed-since', 'HEAD', '--recursive', '.', cwd=repo)
+    assert completed.returncode == 0
+    assert found_files(completed) == {'old.py', 'src/staged.py'}
+
+
+def test_changed_since_limited_to_subdirectory_target(repo: Path):
+    completed = run_nomoemo('--changed-since', 'HEAD', '--recursive', 'src', cwd=repo)
+    assert completed.returncode == 0
+    assert found_files(completed) == {'src/staged.py'}
+
+
+def test_changed_since_without_recursive_skips_subdirectories(repo: Path):
+    completed = run_nomoemo('--changed-since', 'HEAD', '.', cwd=repo)
+    assert completed.returncode == 0
+    assert found_files(completed) == {'old.py'}
+
+
+def test_changed_since_bad_ref_fails(repo: Path):
+    completed = run_nomoemo('--changed-since', 'no-such-ref', '--recursive', '.', cwd=repo)
+    assert completed.returncode == 1
+    assert found_files(completed) == set()
@@ -0,0 +1,98 @@
+"""Tests that .gitignore handling during traversal agrees with git itself."""
+
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+import nomoemo
+
+pytestmark = pytest.mark.skipif(shutil.which('git') is None, reason='git is not installed')
+
+GITIGNORE = '''\
+# Negation and directory-only patterns
+*.log
+!keep.log
+build/
+!build/keep.py
+logs/*
+!logs/important/
+# ** patterns
+**/generated/**
+docs/**/*.tmp
+/root_only.txt
+'''
+
+NESTED_GITIGNORE = '''\
+!*.log
+/local.py
+'''
+
+FILES = [
+    'a.py', 'debug.log', 'keep.log', 'generated.py', 'root_only.txt',
+    'build/out.py', 'build/keep.py', 'lib/build',
+    'src/build/gen.py', 'src/generated/a.py', 'src/deep/generated/b.py', 'src/generated.py',
+    'docs/a.tmp', 'docs/x/y/b.tmp', 'docs/b.py',
+    'logs/a.py', 'logs/important/b.py',
+    'sub/debug.log', 'sub/local.py', 'sub/root_only.txt', 'sub/deeper/local.py',
+]
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    subprocess.run(['git', 'init', '-q'], cwd=tmp_path, check=True)
+    (tmp_path / '.gitignore').write_text(GITIGNORE, encoding='utf-8')
+    (tmp_path / 'sub').mkdir()
+    (tmp_path / 'sub' / '.gitignore').write_text(NESTED_GITIGNORE, encoding='utf-8')
+    for name in FILES:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text('# \U0001F600\n', encoding='utf-8')
+    return tmp_path
+
+
+def git_visible(repo: Path, root: Path) -> set:
+    """Files under root that git check-ignore does not report, relative to root."""
+    paths = []
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames[:] = [name for name in dirnames if name != '.git']
+        paths.extend(Path(directory, name).relative_to(repo).as_posix() for name in filenames)
+    completed = subprocess.run(
+        ['git', 'check-ignore', '--no-index', '--stdin'], cwd=repo, input='\n'.join(paths) + '\n',
+        capture_output=True, text=True
+    )
+    assert completed.returncode in (0, 1), completed.stderr
+    ignored = set(completed.stdout.splitlines())
+    return {(repo / path).relative_to(root).as_posix() for path in paths if path not in ignored}
+
+
+def walked(root: Path) -> set:
+    app = nomoemo.NoMoEmo(worker=True, recursive=True)
+    return {path.relative_to(root).as_posix() for path in app._walk_directory(root)}
+
+
+@pytest.mark.parametrize('subdir', ['', 'src', 'sub', 'logs'])
+def test_traversal_matches_git_check_ignore(repo: Path, subdir: str):
+    root = repo / subdir
+    assert walked(root) == git_visible(repo, root)
+
+
+def test_negation_and_directory_only_patterns(repo: Path):
+    files = walked(repo)
+    assert {'keep.log', 'lib/build', 'logs/important/b.py', 'sub/debug.log', 'sub/deeper/local.py'} <= files
+    # A file cannot be re-included when its directory is ignored
+    assert not {'debug.log', 'build/keep.py', 'logs/a.py', 'sub/local.py'} & files
+
+
+def test_double_star_patterns(repo: Path):
+    files = walked(repo)
+    assert {'generated.py', 'src/generated.py', 'docs/b.py'} <= files
+    assert not {'src/generated/a.py', 'src/deep/generated/b.py', 'docs/a.tmp', 'docs/x/y/b.tmp'} & files
+
+
+def test_no_ignore_walks_everything(repo: Path):
+    app = nomoemo.NoMoEmo(worker=True, recursive=True, no_ignore=True)
+    files = {path.relative_to(repo).as_posix() for path in app._walk_directory(repo)}
+    assert set(FILES) <= files
@@ -0,0 +1,44 @@
+"""Tests for the emoji sequence matcher."""
+
+import emoji
+
+import nomoemo
+
+
+def emoji_spans(text: str):
+    return [(match['match_start'], match['match_end']) for match in emoji.emoji_list(text)]
+
+
+def test_every_emoji_matches_like_emoji_list():
+    matcher = nomoemo.get_emoji_matcher()
+    mismatches = []
+    for sequence in emoji.EMOJI_DATA:
+        text = f'x = "{sequence}" # {sequence} {sequence}\n'
+        if matcher.find_spans(text) != emoji_spans(text):
+            mismatches.append(sequence)
+    assert mismatches == []
+
+
+def test_zwj_sequences_match_like_emoji_list():
+    matcher = nomoemo.get_emoji_matcher()
+    for text in ('\U0001F468\u200d\U0001F469\u200d\U0001F467', '\U0001F3F3\ufe0f\u200d\U0001F308', 'a\u200db'):
+        assert matcher.find_spans(text) == emoji_spans(text)
+
+
+def test_stray_skin_tone_is_absorbed():
+    # emoji_list reports the modifier as a second emoji; it belongs to the first
+    matcher = nomoemo.get_emoji_matcher()
+    text = '\U0001F600\U0001F3FD'
+    assert emoji_spans(text) == [(0, 1), (1, 2)]
+    assert matcher.find_spans(text) == [(0, 2)]
+    assert matcher.find_spans('x\U0001F3FDx') == [(1, 2)]
+    assert matcher.find_spans('\U0001F3FD\U0001F3FD') == [(0, 2)]
+
+
+def test_stray_variation_selector_is_absorbed():
+    # emoji_list leaves the selector behind, which --remove would then keep
+    matcher = nomoemo.get_emoji_matcher()
+    assert emoji_spans('\U0001F600\ufe0f') == [(0, 1)]
+    assert matcher.find_spans('\U0001F600\ufe0f') == [(0, 2)]
+    assert matcher.find_spans('\u2764\ufe0f\ufe0f') == [(0, 3)]
+    assert matcher.find_spans('\ufe0f') == []
@@ -0,0 +1,51 @@
+"""Tests for the --format reporters and --max-findings-per-file."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from conftest import run_nomoemo
+
+
+@pytest.fixture
+def sample(tmp_path: Path) -> Path:
+    (tmp_path / 'sample.py').write_text('x = 1\ny = "\U0001F600 caf\u00e9 \U0001F680"\n', encoding='utf-8')
+    return tmp_path
+
+
+def test_jsonl_emoji_records(sample: Path):
+    completed = run_nomoemo('--format', 'jsonl', 'sample.py', cwd=sample)
+    assert completed.returncode == 0
+    records = [json.loads(line) for line in completed.stdout.splitlines()]
+    assert [(r['line'], r['column'], r['rule']) for r in records] == [(2, 6, 'emoji'), (2, 13, 'emoji')]
+    assert '[-] Found' not in completed.stderr
+
+
+def test_jsonl_charset_records_are_capped(sample: Path):
+    completed = run_nomoemo('--ascii-only', '--format', 'jsonl', '--max-findings-per-file', '1', 'sample.py', cwd=sample)
+    records = [json.loads(line) for line in completed.stdout.splitlines()]
+    assert records[0]['codepoint'] == 'U+1F600'
+    assert records[1] == {'path': 'sample.py', 'truncated': True, 'total': 3, 'reported': 1}
+    assert 'Total: 3 non-ASCII' in completed.stderr
+
+
+def test_sarif_output_file(sample: Path):
+    completed = run_nomoemo('--latin1-only', '--format', 'sarif', '--output', 'report.sarif', 'sample.py', cwd=sample)
+    assert completed.returncode == 0
+    assert completed.stdout == ''
+    log = json.loads((sample / 'report.sarif').read_text(encoding='utf-8'))
+    results = log['runs'][0]['results']
+    assert [r['ruleId'] for r in results] == ['non-latin1', 'non-latin1']
+    assert results[1]['locations'][0]['physicalLocation']['region']['startColumn'] == 13
+
+
+def test_text_format(sample: Path):
+    completed = run_nomoemo('--format', 'text', 'sample.py', cwd=sample)
+    assert completed.stdout.splitlines()[0].startswith('sample.py:2:6: emoji: ')
+
+
+def test_format_rejected_for_rewrites(sample: Path):
+    completed = run_nomoemo('--remove', '--force', '--format', 'jsonl', 'sample.py', cwd=sample)
+    assert completed.returncode == 1
+    assert '\U0001F600' in (sample / 'sample.py').read_text(encoding='utf-8')
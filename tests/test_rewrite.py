@@ -0,0 +1,44 @@
+"""Tests for the atomic rewrite of files by --remove and --replace."""
+
+import os
+import stat
+import sys
+from pathlib import Path
+
+import pytest
+
+import nomoemo
+
+
+def test_rewrite_keeps_line_endings_and_mode(tmp_path: Path):
+    path = tmp_path / 'script.sh'
+    path.write_bytes('#!/bin/sh\r\necho "\U0001F680 go"\r\necho ok\n'.encode('utf-8'))
+    path.chmod(0o751)
+    assert nomoemo.rewrite_file(path) == 1
+    assert path.read_bytes() == b'#!/bin/sh\r\necho " go"\r\necho ok\n'
+    assert stat.S_IMODE(path.stat().st_mode) == 0o751
+    assert os.listdir(tmp_path) == ['script.sh']
+
+
+def test_failed_write_leaves_file_and_no_temp_file(tmp_path: Path):
+    path = tmp_path / 'a.py'
+    path.write_bytes(b'original\n')
+    
+    def pieces():
+        yield b'partial'
+        raise OSError('disk full')
+    
+    with pytest.raises(OSError, match='disk full'):
+        nomoemo._atomic_write(path, pieces())
+    assert path.read_bytes() == b'original\n'
+    assert os.listdir(tmp_path) == ['a.py']
+
+
+@pytest.mark.skipif(sys.platform == 'win32' or os.geteuid() != 0, reason='needs root to give files away')
+def test_rewrite_keeps_owner_and_group(tmp_path: Path):
+    path = tmp_path / 'owned.py'
+    path.write_bytes('x = "\U0001F600"\n'.encode('utf-8'))
+    os.chown(path, 65534, 65534)
+    assert nomoemo.rewrite_file(path, '*') == 1
+    assert path.read_bytes() == b'x = "*"\n'
+    assert (path.stat().st_uid, path.stat().st_gid) == (65534, 65534)
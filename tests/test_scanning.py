@@ -0,0 +1,49 @@
+"""Tests that the region, memory-mapped and streaming scans agree with a plain decode."""
+
+import random
+from pathlib import Path
+
+import pytest
+
+import nomoemo
+
+
+def long_line_text() -> str:
+    """Long lines with sparse non-ASCII, far enough apart to fall in separate regions."""
+    rng = random.Random(7)
+    pieces = []
+    for _ in range(60):
+        pieces.append('x' * rng.randint(1, 20000))
+        pieces.append(rng.choice(['\u00e9', '\U0001F600', '\u4e2d\u00e9', '\U0001F44D\U0001F3FD', '\n', '\r\n']))
+    return ''.join(pieces)
+
+
+@pytest.mark.parametrize('options', [{}, {'no_mmap': True}, {'stream_threshold': 64 * 1024}])
+@pytest.mark.parametrize('mode', ['emoji', 'ascii'])
+def test_long_lines_match_plain_decode(tmp_path: Path, monkeypatch, options, mode):
+    text = long_line_text()
+    path = tmp_path / 'minified.js'
+    path.write_bytes(text.encode('utf-8'))
+    monkeypatch.setattr(nomoemo, 'MMAP_THRESHOLD', 64 * 1024)
+    app = nomoemo.NoMoEmo(worker=True, verbose=True, **options)
+    expected = [(f.line, f.column, f.text) for f in nomoemo.scan_text(text, mode)]
+    assert expected
+    
+    result = nomoemo.FileResult(path)
+    assert app._scan_text(path, nomoemo._processor(app, result, mode))
+    assert [(f.line, f.column, f.text) for f in nomoemo._findings(result, mode, path)] == expected
+
+
+def test_zwj_sequence_across_stream_chunks(tmp_path: Path):
+    # A family with skin tones: seven codepoints, 34 bytes, split at every byte
+    sequence = '\U0001F468\U0001F3FD\u200d\U0001F469\U0001F3FD\u200d\U0001F467\U0001F3FD'
+    encoded = sequence.encode('utf-8')
+    app = nomoemo.NoMoEmo(worker=True, verbose=True, no_mmap=True, stream_threshold=64 * 1024)
+    path = tmp_path / 'big.txt'
+    for offset in range(nomoemo.STREAM_CHUNK_SIZE - len(encoded) - 1, nomoemo.STREAM_CHUNK_SIZE + 2):
+        path.write_bytes(b'a\n' + b'x' * (offset - 2) + encoded + b'\n' + b'y' * 1000)
+        result = nomoemo.FileResult(path)
+        assert app._scan_text(path, nomoemo._processor(app, result, 'emoji'))
+        assert result.count == 1, offset
+        assert [(f.line, f.column, f.text) for f in nomoemo._findings(result, 'emoji', path)] == [
+            (2, offset - 1, sequence)], offset
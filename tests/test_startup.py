@@ -0,0 +1,43 @@
+"""Tests that startup only loads what the selected mode needs."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from conftest import ROOT
+
+# Modules that only some options need, imported where they are used
+DEFERRED = ['emoji', 'sqlite3', 'hashlib', 'subprocess', 'tempfile', 'concurrent.futures', 'difflib', 'socket',
+            'cProfile']
+
+
+def loaded_after(*args: str) -> set:
+    """Run nomoemo.main(args) in a fresh interpreter; return which DEFERRED modules it loaded."""
+    code = (f"import json, sys; sys.path.insert(0, {str(ROOT)!r}); import nomoemo\n"
+            f"try:\n    nomoemo.main({list(args)!r})\nexcept SystemExit:\n    pass\n"
+            f"print(json.dumps([name for name in {DEFERRED!r} if name in sys.modules]))")
+    completed = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    return set(json.loads(completed.stdout.splitlines()[-1]))
+
+
+def test_import_and_version_load_nothing_deferred():
+    assert loaded_after('--version') == set()
+
+
+def test_charset_modes_never_load_emoji_data(tmp_path: Path):
+    (tmp_path / 'a.py').write_text('caf\u00e9 \U0001F600\n', encoding='utf-8')
+    assert loaded_after('--ascii-only', '--quiet', str(tmp_path / 'a.py')) == set()
+    assert loaded_after('--latin1-only', '--quiet', '--recursive', str(tmp_path)) == set()
+
+
+def test_emoji_mode_loads_emoji_data(tmp_path: Path):
+    (tmp_path / 'a.py').write_text('\U0001F600\n', encoding='utf-8')
+    loaded = loaded_after('--quiet', str(tmp_path / 'a.py'))
+    assert 'emoji' in loaded
+    assert not loaded & {'sqlite3', 'subprocess', 'concurrent.futures', 'difflib', 'socket', 'cProfile'}
+
+
+def test_invalid_arguments_fail_before_loading_emoji_data(tmp_path: Path):
+    (tmp_path / 'a.py').write_text('\U0001F600\n', encoding='utf-8')
+    assert loaded_after('--jobs', '-1', str(tmp_path / 'a.py')) == set()
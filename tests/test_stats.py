@@ -0,0 +1,38 @@
+"""Tests for --stats and --profile."""
+
+import json
+import pstats
+from pathlib import Path
+
+from conftest import run_nomoemo
+
+
+def make_tree(root: Path):
+    (root / 'clean.py').write_text('x = 1\n', encoding='utf-8')
+    (root / 'emoji.py').write_text('x = "\U0001F600"\n', encoding='utf-8')
+    (root / 'data.dat').write_bytes(b'\x00\x01\x02')
+
+
+def test_stats_json_outcomes_and_bytes(tmp_path: Path):
+    make_tree(tmp_path)
+    completed = run_nomoemo('--remove', '--force', '--stats', 'json', '--stats-slowest', '2', '.', cwd=tmp_path)
+    assert completed.returncode == 0
+    summary = json.loads(completed.stderr[completed.stderr.index('{'):])
+    assert summary['files'] == {'clean': 1, 'findings': 0, 'modified': 1, 'skipped': 1, 'cached': 0, 'error': 0}
+    assert summary['bytes_read'] == 6 + 11 + 3
+    assert summary['bytes_written'] == 7
+    assert set(summary['phases']) == {'traversal', 'cache', 'read', 'match', 'write', 'report'}
+    assert len(summary['slowest']) == 2
+
+
+def test_stats_table_with_jobs(tmp_path: Path):
+    make_tree(tmp_path)
+    completed = run_nomoemo('--quiet', '--stats', '--jobs', '2', '.', cwd=tmp_path)
+    assert 'Files: 1 clean, 1 findings, 0 modified, 1 skipped' in completed.stderr
+
+
+def test_profile_writes_pstats(tmp_path: Path):
+    make_tree(tmp_path)
+    completed = run_nomoemo('--quiet', '--profile', 'run.prof', '.', cwd=tmp_path)
+    assert completed.returncode == 0
+    assert pstats.Stats(str(tmp_path / 'run.prof')).total_calls > 0
@@ -0,0 +1,55 @@
+"""Tests for reading standard input (target '-' or --stdin)."""
+
+import json
+from pathlib import Path
+
+import nomoemo
+from conftest import run_nomoemo
+
+
+def test_remove_filters_to_stdout_byte_for_byte():
+    completed = run_nomoemo('--remove', '-', input='a \U0001F600 b\r\n#\ufe0f\u20e3 caf\u00e9\n'.encode('utf-8'))
+    assert completed.returncode == 0
+    assert completed.stdout == 'a  b\r\n caf\u00e9\n'.encode('utf-8')
+    assert b'Removed 2 emojis from <stdin>' in completed.stderr
+
+
+def test_replace_matches_file_mode_across_read_boundaries(tmp_path: Path):
+    line = 'x' * 70 + '\U0001F468\u200d\U0001F469\u200d\U0001F467 \U0001F44D\U0001F3FD'
+    data = ('\n'.join([line] * 4000) + '\U0001F600' * 100000).encode('utf-8')  # Ends in one long line
+    completed = run_nomoemo('--replace', '--replacement', '*', '--stdin', '--quiet', input=data)
+    path = tmp_path / 'same.txt'
+    path.write_bytes(data)
+    assert nomoemo.rewrite_file(path, '*') == 108000
+    assert completed.stdout == path.read_bytes()
+
+
+def test_scan_modes_report_stdin_findings():
+    data = 'ok\nb \U0001F680 caf\u00e9\n'.encode('utf-8')
+    completed = run_nomoemo('--ascii-only', '--format', 'jsonl', '-', input=data)
+    records = [json.loads(line) for line in completed.stdout.splitlines()]
+    assert [(r['path'], r['line'], r['column'], r['codepoint']) for r in records] == [
+        ('<stdin>', 2, 3, 'U+1F680'), ('<stdin>', 2, 8, 'U+00E9')]
+    completed = run_nomoemo('-', input=data)
+    assert completed.stdout == b''
+    assert b'Found 1 emoji(s) in <stdin>' in completed.stderr
+
+
+def test_binary_input_passes_through_unchanged():
+    data = b'\x00\x01' + '\U0001F600'.encode('utf-8') * 1000
+    completed = run_nomoemo('--remove', '-', input=data)
+    assert completed.returncode == 0
+    assert completed.stdout == data
+
+
+def test_stdin_rejects_target_and_watch():
+    assert run_nomoemo('--stdin', 'file.py', input=b'').returncode == 1
+    assert run_nomoemo('--watch', '-', input=b'').returncode == 1
+
+
+def test_stream_split_never_cuts_a_sequence():
+    assert nomoemo._stream_split(b'a\nb') == 2
+    assert nomoemo._stream_split('x #\ufe0f'.encode('utf-8')) == 2
+    assert nomoemo._stream_split('\U0001F600'.encode('utf-8')) == 0
+    long_run = '\u00e9'.encode('utf-8') * (nomoemo.STDIN_MAX_CARRY // 2 + 1)
+    assert nomoemo._stream_split(long_run) == len(long_run) - 2
@@ -0,0 +1,85 @@
+"""Tests for --watch, run against a temporary tree."""
+
+import queue
+import signal
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from conftest import NOMOEMO, run_nomoemo
+
+pytestmark = pytest.mark.skipif(sys.platform == 'win32', reason='stops the watcher with SIGINT')
+
+
+def read_until(process: subprocess.Popen, text: str, timeout: float = 30) -> list:
+    """Return the stderr lines up to and including the first one containing text."""
+    lines = []
+    while not lines or text not in lines[-1]:
+        try:
+            line = process.lines.get(timeout=timeout)
+        except queue.Empty:
+            pytest.fail(f'no {text!r} in {lines}')
+        assert line is not None, f'watcher exited before {text!r}: {lines}'
+        lines.append(line.rstrip('\n'))
+    return lines
+
+
+def pump(process: subprocess.Popen):
+    for line in process.stderr:
+        process.lines.put(line)
+    process.lines.put(None)
+
+
+@pytest.fixture
+def watch(tmp_path: Path):
+    """Start a watcher on tmp_path; yields a function taking extra arguments."""
+    processes = []
+    
+    def start(*args: str) -> subprocess.Popen:
+        process = subprocess.Popen([sys.executable, str(NOMOEMO), '--watch', '--recursive', '--watch-interval', '0.05',
+                                    '--watch-debounce', '0.05', *args, str(tmp_path)],
+                                   stderr=subprocess.PIPE, text=True, encoding='utf-8')
+        processes.append(process)
+        process.lines = queue.Queue()
+        threading.Thread(target=pump, args=(process,), daemon=True).start()
+        read_until(process, 'Watching')
+        return process
+    
+    yield start
+    for process in processes:
+        process.send_signal(signal.SIGINT)
+        assert process.wait(timeout=10) == 0
+
+
+def test_watch_reports_only_new_and_fixed_findings(watch, tmp_path: Path):
+    (tmp_path / 'a.py').write_text('# \U0001F600\n', encoding='utf-8')
+    process = watch()
+    
+    (tmp_path / 'a.py').write_text('inserted\n# \U0001F600\nx = 1  # \U0001F680\n', encoding='utf-8')
+    lines = read_until(process, 'Rescanned')
+    assert [line for line in lines if 'New in' in line or 'Fixed in' in line] == [
+        f"[INFO] [-] New in {tmp_path / 'a.py'}, Line 3, Col 10: serted # \U0001F600 x = 1  # [EMOJI] ",
+    ]
+    assert '1 new, 0 fixed; 2 finding(s) in 1 files.' in lines[-1]
+    
+    (tmp_path / 'a.py').unlink()
+    lines = read_until(process, 'Rescanned')
+    assert sum('Fixed in' in line for line in lines) == 2
+    assert '0 new, 2 fixed; 0 finding(s) in 0 files.' in lines[-1]
+
+
+def test_watch_charset_mode_picks_up_new_files(watch, tmp_path: Path):
+    process = watch('--ascii-only')
+    (tmp_path / 'b.txt').write_text('caf\u00e9\n', encoding='utf-8')
+    lines = read_until(process, 'Rescanned')
+    assert f"[INFO] [-] New in {tmp_path / 'b.txt'}, Line 1, Col 4: U+00E9 '\u00e9' - caf[U+00E9] " in lines
+    assert 'Rescanned 1 file(s): 1 new, 0 fixed' in lines[-1]
+
+
+def test_watch_rejects_rewrite_modes(tmp_path: Path):
+    completed = run_nomoemo('--watch', '--remove', '--force', str(tmp_path))
+    assert completed.returncode == 1
+    assert '--watch can only be used' in completed.stderr